@@ -0,0 +1,17 @@
+def calculate_wind_field(x_grid, y_grid, hour):
+    """Calculate a simple diurnal wind field (u, v in m/s) on the model grid"""
+
+    # Background wind strengthens in the afternoon and veers through the day
+    speed = 3 + 2 * np.sin(2 * np.pi * (hour - 9) / 24)
+    direction = np.pi / 4 + 0.3 * np.sin(2 * np.pi * hour / 24)
+
+    # Gentle spatial structure: flow speeds up across the domain and
+    # curves slightly with distance from the southern edge
+    x_scale = x_grid.max() if x_grid.max() > 0 else 1.0
+    y_scale = y_grid.max() if y_grid.max() > 0 else 1.0
+    acceleration = 1 + 0.2 * np.sin(np.pi * x_grid / x_scale)
+    turning = 0.1 * np.sin(np.pi * y_grid / y_scale)
+
+    u = speed * acceleration * np.cos(direction + turning)
+    v = speed * acceleration * np.sin(direction + turning)
+    return u, v
@@ -0,0 +1,177 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DispersionState:
+    """Everything a dispersion run needs to continue where it stopped
+
+    Holds the particle arrays, the accumulated deposition and far-field
+    grids, the receptor time series, the model time and step, and the
+    random number state: with a seed, the CounterRNG needs only the seed
+    and step; without one, the global np.random state is captured at each
+    checkpoint and restored on resume. A run resumed from a checkpoint
+    therefore follows exactly the trajectory of an uninterrupted run.
+
+    Checkpoints are uncompressed .npz files of plain arrays. save_async
+    copies the arrays on the calling thread (cheap) and writes them on a
+    background thread, so the model keeps stepping while the file is
+    written; files are written under a temporary name and renamed, so a
+    crash never leaves a truncated checkpoint behind.
+    """
+
+    FORMAT = 1
+
+    def __init__(self, particles, deposition, far_field, receptors=None, seed=None,
+                 current_hour=0.0, step=0, num_released=None):
+        self.particles = particles
+        self.deposition = deposition
+        self.far_field = far_field
+        self.receptors = receptors
+        self.seed = seed
+        self.rng = CounterRNG(seed) if seed is not None else None
+        self.current_hour = current_hour
+        self.step = step
+        self.num_released = len(particles) if num_released is None else num_released
+
+        # Global np.random state to restore on resume (runs without a seed)
+        self.np_random_state = None
+
+        self._writer = None
+        self._pending = None
+
+    @classmethod
+    def start(cls, particles, x_grid, y_grid, receptors=None, seed=None):
+        """Create the state at the start of a run"""
+        return cls(particles, DepositionGrid(x_grid, y_grid), ConcentrationGrid(x_grid, y_grid),
+                   receptors, seed)
+
+    def to_arrays(self):
+        """Return a dict of array copies describing the full state"""
+        arrays = {
+            'format': np.int64(self.FORMAT),
+            'current_hour': np.float64(self.current_hour),
+            'step': np.int64(self.step),
+            'seed': np.int64(-1 if self.seed is None else self.seed),
+            'num_released': np.int64(self.num_released),
+            'next_id': np.int64(self.particles.next_id),
+            'deposition_x_edges': self.deposition.x_edges.copy(),
+            'deposition_y_edges': self.deposition.y_edges.copy(),
+            'deposition_mass': self.deposition.mass.copy(),
+            'deposition_outside_mass': np.float64(self.deposition.outside_mass),
+            'deposition_count': np.int64(self.deposition.count),
+            'far_field_x_nodes': self.far_field.x_nodes.copy(),
+            'far_field_y_nodes': self.far_field.y_nodes.copy(),
+            'far_field_mass': self.far_field.mass.copy(),
+            'far_field_exported_mass': np.float64(self.far_field.exported_mass),
+            'far_field_reference_height': np.float64(self.far_field.reference_height),
+        }
+        for name in ParticleArray.COLUMNS:
+            arrays['particles_' + name] = getattr(self.particles, name).copy()
+
+        if self.receptors is not None:
+            times, values = self.receptors.time_series()
+            arrays.update({
+                'receptors_x': self.receptors.x.copy(),
+                'receptors_y': self.receptors.y.copy(),
+                'receptors_z': self.receptors.z.copy(),
+                'receptors_radius': np.float64(self.receptors.radius),
+                'receptors_names': np.array(self.receptors.names),
+                'receptors_times': times,
+                'receptors_values': values,
+            })
+
+        if self.seed is None:
+            _, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+            arrays.update({
+                'np_random_keys': keys.copy(),
+                'np_random_position': np.int64(position),
+                'np_random_has_gauss': np.int64(has_gauss),
+                'np_random_cached_gaussian': np.float64(cached_gaussian),
+            })
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild a state from the dict produced by to_arrays"""
+        if int(arrays['format']) != cls.FORMAT:
+            raise ValueError(f"Unsupported checkpoint format {int(arrays['format'])}")
+
+        particles = ParticleArray.__new__(ParticleArray)
+        for name in ParticleArray.COLUMNS:
+            setattr(particles, name, np.array(arrays['particles_' + name]))
+        particles.next_id = int(arrays['next_id'])
+
+        deposition = DepositionGrid(*np.meshgrid(arrays['deposition_x_edges'], arrays['deposition_y_edges']))
+        deposition.mass = np.array(arrays['deposition_mass'])
+        deposition.outside_mass = float(arrays['deposition_outside_mass'])
+        deposition.count = int(arrays['deposition_count'])
+
+        far_field = ConcentrationGrid(*np.meshgrid(arrays['far_field_x_nodes'], arrays['far_field_y_nodes']),
+                                      reference_height=float(arrays['far_field_reference_height']))
+        far_field.mass = np.array(arrays['far_field_mass'])
+        far_field.exported_mass = float(arrays['far_field_exported_mass'])
+
+        receptors = None
+        if 'receptors_x' in arrays:
+            receptors = ReceptorNetwork(arrays['receptors_x'], arrays['receptors_y'], arrays['receptors_z'],
+                                        radius=float(arrays['receptors_radius']),
+                                        names=[str(name) for name in arrays['receptors_names']])
+            receptors.times = [float(t) for t in arrays['receptors_times']]
+            receptors.values = list(np.array(arrays['receptors_values']))
+
+        seed = int(arrays['seed'])
+        state = cls(particles, deposition, far_field, receptors, None if seed < 0 else seed,
+                    float(arrays['current_hour']), int(arrays['step']), int(arrays['num_released']))
+        if 'np_random_keys' in arrays:
+            state.np_random_state = ('MT19937', np.array(arrays['np_random_keys']),
+                                     int(arrays['np_random_position']), int(arrays['np_random_has_gauss']),
+                                     float(arrays['np_random_cached_gaussian']))
+        return state
+
+    @staticmethod
+    def _write(path, arrays):
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temporary, path)
+
+    def save(self, path):
+        """Write a checkpoint now"""
+        self.wait()
+        self._write(path, self.to_arrays())
+
+    def save_async(self, path):
+        """Snapshot the state now and write the checkpoint on a background thread
+
+        At most one write is in flight; a new checkpoint first waits for
+        the previous one.
+        """
+        self.wait()
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1)
+        self._pending = self._writer.submit(self._write, path, self.to_arrays())
+
+    def wait(self):
+        """Block until a background checkpoint write has finished (re-raising its errors)"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def close(self):
+        """Finish any pending write and stop the writer thread"""
+        self.wait()
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
+
+    @classmethod
+    def load(cls, path):
+        """Read a checkpoint written by save or save_async"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays({name: data[name] for name in data.files})
+
+    def restore_random_state(self):
+        """Reinstate the global np.random state captured in a checkpoint"""
+        if self.np_random_state is not None:
+            np.random.set_state(self.np_random_state)
+            self.np_random_state = None
@@ -0,0 +1,154 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MemmapMetProvider(MetProvider):
+    """Streamed 3D gridded meteorology from a memory-mapped binary file
+
+    Only the frames in use are ever read: the file is mapped with np.memmap,
+    each frame is copied out when first needed, and while the model works on
+    the current frame the next one is read on a background thread (double
+    buffering), so disk reads overlap with particle updates.
+
+    File layout (little-endian):
+
+        offset  size          contents
+        0       8             magic b'DISPMET1'
+        8       4 x uint32    nx, ny, nz, num_frames
+        24      5 x float64   x0, dx, y0, dy (m) and time_step (hours)
+        64      nz x float64  heights of the vertical levels (m, increasing)
+        ...     num_frames records, each:
+                  4 x float32           mixing_height, sigma_h_factor,
+                                        sigma_z_factor, is_daytime
+                  nz x ny x nx float32  u (m/s)
+                  nz x ny x nx float32  v (m/s)
+
+    Frame k is valid at hour k * time_step.
+    """
+
+    MAGIC = b'DISPMET1'
+    HEADER_DTYPE = np.dtype([
+        ('magic', 'S8'), ('nx', '<u4'), ('ny', '<u4'), ('nz', '<u4'), ('num_frames', '<u4'),
+        ('x0', '<f8'), ('dx', '<f8'), ('y0', '<f8'), ('dy', '<f8'), ('time_step', '<f8')
+    ])
+
+    @staticmethod
+    def record_dtype(nx, ny, nz):
+        return np.dtype([
+            ('stability', '<f4', (4,)),
+            ('u', '<f4', (nz, ny, nx)),
+            ('v', '<f4', (nz, ny, nx))
+        ])
+
+    def __init__(self, path, period=None, cache_size=3, prefetch=True):
+        header = np.fromfile(path, dtype=self.HEADER_DTYPE, count=1)[0]
+        if header['magic'] != self.MAGIC:
+            raise ValueError(f"{path} is not a dispersion met file")
+        nx, ny, nz = int(header['nx']), int(header['ny']), int(header['nz'])
+        num_frames = int(header['num_frames'])
+
+        x_grid, y_grid = np.meshgrid(header['x0'] + header['dx'] * np.arange(nx),
+                                     header['y0'] + header['dy'] * np.arange(ny))
+        super().__init__(x_grid, y_grid, float(header['time_step']), period, num_frames, cache_size)
+
+        self.levels = np.fromfile(path, dtype='<f8', count=nz, offset=self.HEADER_DTYPE.itemsize)
+        self.records = np.memmap(path, dtype=self.record_dtype(nx, ny, nz), mode='r',
+                                 offset=self.HEADER_DTYPE.itemsize + 8 * nz, shape=(num_frames,))
+
+        self._executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        self._pending = {}
+
+    @classmethod
+    def write(cls, path, frames, x0, dx, y0, dy, levels, time_step=1.0):
+        """Write a met file, one frame at a time
+
+        Args:
+            frames: Iterable of (u, v, stability) per frame, with u and v of
+                shape (nz, ny, nx) and stability a dict like the one from
+                calculate_stability_parameters
+        """
+        levels = np.asarray(levels, dtype='<f8')
+        header = np.zeros(1, dtype=cls.HEADER_DTYPE)
+        num_frames = 0
+        with open(path, 'wb') as f:
+            f.write(header.tobytes())  # rewritten once the frame count and grid are known
+            f.write(levels.tobytes())
+            for u, v, stability in frames:
+                record = np.zeros(1, dtype=cls.record_dtype(u.shape[2], u.shape[1], u.shape[0]))
+                record['stability'] = (stability['mixing_height'], stability['sigma_h_factor'],
+                                       stability['sigma_z_factor'], stability['is_daytime'])
+                record['u'] = u
+                record['v'] = v
+                f.write(record.tobytes())
+                num_frames += 1
+                nz, ny, nx = u.shape
+
+            if num_frames == 0:
+                raise ValueError("A met file needs at least one frame")
+            header[0] = (cls.MAGIC, nx, ny, nz, num_frames, x0, dx, y0, dy, time_step)
+            f.seek(0)
+            f.write(header.tobytes())
+
+    def _read_frame(self, index):
+        record = self.records[index]
+        return np.array(record['u']), np.array(record['v'])
+
+    def _compute_frame(self, index):
+        pending = self._pending.pop(index, None)
+        fields = pending.result() if pending is not None else self._read_frame(index)
+
+        # Start reading the next frame while this one is in use
+        following = index + 1
+        if self.period is not None:
+            following %= int(round(self.period / self.time_step))
+        if (self._executor is not None and following < self.num_frames
+                and following not in self._cache and following not in self._pending):
+            self._pending[following] = self._executor.submit(self._read_frame, following)
+        return fields
+
+    def _interpolation_weights(self, x, y, z=None):
+        i, j, tx, ty = super()._interpolation_weights(x, y)
+        if z is None or len(self.levels) == 1:
+            k = np.zeros_like(i)
+            tz = np.zeros(np.shape(tx))
+        else:
+            k = np.clip(np.searchsorted(self.levels, z, side='right') - 1, 0, len(self.levels) - 2)
+            tz = np.clip((np.asarray(z) - self.levels[k]) / (self.levels[k + 1] - self.levels[k]), 0, 1)
+        return i, j, tx, ty, k, tz
+
+    def _sample(self, field, weights):
+        i, j, tx, ty, k, tz = weights
+        if field.shape[0] == 1:
+            return self._bilinear(field[0], i, j, tx, ty)
+        lower = self._bilinear_levels(field, k, i, j, tx, ty)
+        upper = self._bilinear_levels(field, k + 1, i, j, tx, ty)
+        return (1 - tz) * lower + tz * upper
+
+    @staticmethod
+    def _bilinear_levels(field, k, i, j, tx, ty):
+        return ((1 - ty) * ((1 - tx) * field[k, j, i] + tx * field[k, j, i + 1])
+                + ty * ((1 - tx) * field[k, j + 1, i] + tx * field[k, j + 1, i + 1]))
+
+    def stability(self, hour):
+        first, second, weight = self._bracket(hour)
+        values = (1 - weight) * self.records[first]['stability'] + weight * self.records[second]['stability']
+        return {
+            'mixing_height': float(values[0]),
+            'sigma_h_factor': float(values[1]),
+            'sigma_z_factor': float(values[2]),
+            'is_daytime': bool(self.records[first]['stability'][3])
+        }
+
+    def close(self):
+        """Stop the prefetch thread and release the mapping"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pending.clear()
+        self._cache.clear()
+        self.records = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
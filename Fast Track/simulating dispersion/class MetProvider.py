@@ -0,0 +1,168 @@
+from collections import OrderedDict
+
+
+class MetProvider:
+    """Base class for meteorology sources that feed the dispersion model
+
+    Wind fields are produced as frames on a fixed time axis (one every
+    time_step hours) and kept in a least-recently-used cache keyed by the
+    frame index. Winds at arbitrary times are linearly interpolated between
+    the two bracketing frames, and at particle positions bilinearly
+    interpolated on the grid, so evaluating the wind costs one cache lookup
+    plus an O(particles) interpolation instead of a full field
+    recomputation every step.
+
+    Subclasses implement _compute_frame(index) -> (u, v) grids.
+    """
+
+    def __init__(self, x_grid, y_grid, time_step=1.0, period=None, num_frames=None, cache_size=48):
+        self.x_grid = np.asarray(x_grid)
+        self.y_grid = np.asarray(y_grid)
+        self.x_nodes = self.x_grid[0, :]
+        self.y_nodes = self.y_grid[:, 0]
+
+        self.time_step = time_step    # hours between frames
+        self.period = period          # hours after which the fields repeat (None = not periodic)
+        self.num_frames = num_frames  # frames available (None = unbounded)
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _compute_frame(self, index):
+        raise NotImplementedError
+
+    def frame(self, index):
+        """Return the cached (u, v) fields of one frame, computing them on a miss"""
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            self.hits += 1
+            return self._cache[index]
+
+        self.misses += 1
+        fields = self._compute_frame(index)
+        self._cache[index] = fields
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return fields
+
+    def _bracket(self, hour):
+        """Return the two frame indices around a time and the weight of the second"""
+        if self.period is not None:
+            hour = hour % self.period
+        position = hour / self.time_step
+        first = int(np.floor(position))
+        weight = position - first
+
+        if self.period is not None:
+            frames_per_period = int(round(self.period / self.time_step))
+            first %= frames_per_period
+            return first, (first + 1) % frames_per_period, weight
+        if self.num_frames is not None:
+            # Hold the first/last frame outside the covered period
+            if first < 0:
+                return 0, 0, 0.0
+            if first >= self.num_frames - 1:
+                return self.num_frames - 1, self.num_frames - 1, 0.0
+        return first, first + 1, weight
+
+    def fields(self, hour):
+        """Return the (u, v) grids at a time, interpolated between frames"""
+        first, second, weight = self._bracket(hour)
+        u0, v0 = self.frame(first)
+        if weight == 0:
+            return u0, v0
+        u1, v1 = self.frame(second)
+        return (1 - weight) * u0 + weight * u1, (1 - weight) * v0 + weight * v1
+
+    def _interpolation_weights(self, x, y, z=None):
+        """Cell indices and fractional offsets for bilinear interpolation (clamped at the edges)"""
+        fx = np.clip((np.asarray(x) - self.x_nodes[0]) / (self.x_nodes[1] - self.x_nodes[0]),
+                     0, len(self.x_nodes) - 1)
+        fy = np.clip((np.asarray(y) - self.y_nodes[0]) / (self.y_nodes[1] - self.y_nodes[0]),
+                     0, len(self.y_nodes) - 1)
+        i = np.minimum(fx.astype(int), len(self.x_nodes) - 2)
+        j = np.minimum(fy.astype(int), len(self.y_nodes) - 2)
+        return i, j, fx - i, fy - j
+
+    @staticmethod
+    def _bilinear(field, i, j, tx, ty):
+        return ((1 - ty) * ((1 - tx) * field[j, i] + tx * field[j, i + 1])
+                + ty * ((1 - tx) * field[j + 1, i] + tx * field[j + 1, i + 1]))
+
+    def _sample(self, field, weights):
+        """Interpolate one field at the points described by _interpolation_weights"""
+        return self._bilinear(field, *weights)
+
+    def wind_at(self, hour, x, y, z=None):
+        """Return the wind components (u, v) at particle positions and a time"""
+        first, second, weight = self._bracket(hour)
+        weights = self._interpolation_weights(x, y, z)
+
+        u0, v0 = self.frame(first)
+        u = self._sample(u0, weights)
+        v = self._sample(v0, weights)
+        if weight > 0:
+            u1, v1 = self.frame(second)
+            u = (1 - weight) * u + weight * self._sample(u1, weights)
+            v = (1 - weight) * v + weight * self._sample(v1, weights)
+        return u, v
+
+    def stability(self, hour):
+        """Return stability parameters at a time (see calculate_stability_parameters)"""
+        return calculate_stability_parameters(hour % 24)
+
+
+class AnalyticMetProvider(MetProvider):
+    """Frames from an analytic field function such as calculate_wind_field
+
+    The function is evaluated once per frame of the diurnal cycle; with the
+    default 24 h period and a cache of at least one period of frames, every
+    later day is served entirely from the cache.
+    """
+
+    def __init__(self, field_function, x_grid, y_grid, time_step=1.0, period=24, cache_size=48):
+        super().__init__(x_grid, y_grid, time_step, period, None, cache_size)
+        self.field_function = field_function
+
+    def _compute_frame(self, index):
+        return self.field_function(self.x_grid, self.y_grid, index * self.time_step)
+
+
+class GriddedMetProvider(MetProvider):
+    """Frames from gridded wind data, e.g. model output saved with np.savez
+
+    Arrays u and v have shape (frames, ny, nx) on the model grid, with
+    frames every time_step hours starting at hour 0.
+    """
+
+    def __init__(self, u, v, x_grid, y_grid, time_step=1.0, period=None, cache_size=48):
+        super().__init__(x_grid, y_grid, time_step, period, len(u), cache_size)
+        self.u = u
+        self.v = v
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Load an .npz file with arrays u, v, x_grid, y_grid and scalar time_step"""
+        data = np.load(path)
+        return cls(data['u'], data['v'], data['x_grid'], data['y_grid'],
+                   time_step=float(data['time_step']), **kwargs)
+
+    def _compute_frame(self, index):
+        return np.asarray(self.u[index], dtype=float), np.asarray(self.v[index], dtype=float)
+
+
+class ConstantMetProvider(MetProvider):
+    """Uniform, steady wind"""
+
+    def __init__(self, u, v, x_grid, y_grid):
+        super().__init__(x_grid, y_grid, time_step=1.0, period=None, num_frames=1, cache_size=1)
+        self.u = u
+        self.v = v
+
+    def _compute_frame(self, index):
+        return np.full(self.x_grid.shape, float(self.u)), np.full(self.x_grid.shape, float(self.v))
+
+    def wind_at(self, hour, x, y, z=None):
+        return self.u, self.v
@@ -0,0 +1,263 @@
+class ParticleArray:
+    """Column-wise particle state for the vectorized dispersion path
+
+    Holds one NumPy array per attribute instead of one Particle object per
+    particle, so a time step is a handful of array expressions. Particles
+    may settle under gravity; those that reach the ground are deposited and
+    compacted out of the arrays, so the active set shrinks as material
+    leaves the air.
+    """
+
+    # Per-particle arrays, copied together by take() and compact()
+    COLUMNS = ('x', 'y', 'z', 'release_time', 'age', 'id', 'mass', 'settling_velocity')
+
+    def __init__(self, x, y, z, release_time=0.0, mass=1.0, settling_velocity=0.0, ids=None):
+        n = len(x)
+
+        # Position (m)
+        self.x = np.array(x, dtype=float)
+        self.y = np.array(y, dtype=float)
+        self.z = np.array(z, dtype=float)
+
+        # Metadata
+        self.release_time = np.full(n, release_time, dtype=float)
+        self.age = np.zeros(n)  # Time since release in hours
+        self.id = np.arange(n) if ids is None else np.array(ids)
+        self.next_id = int(self.id.max()) + 1 if n else 0  # id for the next new particle
+
+        # Physics: carried mass (kg) and gravitational settling velocity (m/s, downward)
+        self.mass = np.array(np.broadcast_to(mass, n), dtype=float)
+        self.settling_velocity = np.array(np.broadcast_to(settling_velocity, n), dtype=float)
+
+    @classmethod
+    def release(cls, num_particles, location, release_time=0.0, total_mass=1.0, settling_velocity=0.0):
+        """Release particles at a point, sharing the total mass equally"""
+        x = np.full(num_particles, float(location[0]))
+        y = np.full(num_particles, float(location[1]))
+        z = np.full(num_particles, float(location[2]))
+        return cls(x, y, z, release_time, total_mass / num_particles, settling_velocity)
+
+    @classmethod
+    def from_dust_population(cls, population, location, release_time=0.0, fluid_density=1.225, gravity=9.81):
+        """Release a physical_objects.DustPopulation at a point
+
+        Each particle carries its own mass and settles at its own terminal
+        velocity, computed by the population's vectorized drag solver.
+        """
+        n = len(population)
+        settling_velocity = population.terminal_velocities(fluid_density, gravity)
+        return cls(
+            np.full(n, float(location[0])),
+            np.full(n, float(location[1])),
+            np.full(n, float(location[2])),
+            release_time, population.mass_kg, settling_velocity
+        )
+
+    def __len__(self):
+        return len(self.x)
+
+    def update_positions(self, u, v, stability, dt, rng=None, step=0, executor=None, chunk_size=65536):
+        """Advance all particles by wind, diffusion and settling
+
+        Same model as Particle.update_position, plus a downward drift at
+        each particle's settling velocity. Settling particles that reach the
+        ground are deposited and removed from the arrays; passive tracers
+        (zero settling velocity) are reflected as before.
+
+        The arrays are updated in chunks of chunk_size particles, in
+        parallel when an executor (thread pool) is given; NumPy releases the
+        GIL inside the array operations. With a CounterRNG each chunk draws
+        its own random numbers from the particle ids and the step, so the
+        result does not depend on the number of threads or the chunking.
+
+        Args:
+            u, v: Wind components (m/s), scalars or one value per particle
+            stability: Stability parameters (see calculate_stability_parameters)
+            dt: Time step in hours
+            rng: CounterRNG, or an np.random-style generator (default: the
+                global np.random state, drawn up front for all particles)
+            step: Step number, the counter for a CounterRNG
+            executor: Optional concurrent.futures executor for the chunks
+            chunk_size: Particles per chunk
+
+        Returns:
+            ParticleArray of the particles deposited during this step
+        """
+        rng = np.random if rng is None else rng
+        n = len(self)
+        dt_seconds = dt * 3600
+
+        sigma_h = 10 * stability['sigma_h_factor'] * np.sqrt(dt_seconds)
+        sigma_z = 5 * stability['sigma_z_factor'] * np.sqrt(dt_seconds)
+
+        if isinstance(rng, CounterRNG):
+            noise = None
+        else:
+            # Sequential generators must be drawn in one place, in order
+            noise = np.stack((rng.normal(0, sigma_h, n), rng.normal(0, sigma_h, n), rng.normal(0, sigma_z, n)))
+
+        deposited = np.empty(n, dtype=bool)
+
+        def update_chunk(start):
+            chunk = slice(start, min(start + chunk_size, n))
+            if noise is None:
+                normals = rng.standard_normal(self.id[chunk], step)
+                dx_diffusion = sigma_h * normals[0]
+                dy_diffusion = sigma_h * normals[1]
+                dz_diffusion = sigma_z * normals[2]
+            else:
+                dx_diffusion, dy_diffusion, dz_diffusion = noise[:, chunk]
+
+            # Advection + diffusion, plus settling in the vertical
+            x, y, z = self.x[chunk], self.y[chunk], self.z[chunk]
+            x += (u[chunk] if np.ndim(u) else u) * dt_seconds + dx_diffusion
+            y += (v[chunk] if np.ndim(v) else v) * dt_seconds + dy_diffusion
+            z += dz_diffusion - self.settling_velocity[chunk] * dt_seconds
+            self.age[chunk] += dt
+
+            # Dry deposition: settling particles stick at the ground
+            settling = self.settling_velocity[chunk] > 0
+            np.logical_and(z < 0, settling, out=deposited[chunk])
+
+            # Boundary conditions for the rest
+            # Reflection at ground
+            np.copyto(z, np.abs(z), where=~deposited[chunk])
+
+            # Reflection at mixing height
+            mixing_height = stability['mixing_height']
+            np.copyto(z, 2 * mixing_height - z, where=z > mixing_height)
+
+        starts = range(0, n, chunk_size)
+        if executor is None:
+            for start in starts:
+                update_chunk(start)
+        else:
+            list(executor.map(update_chunk, starts))
+
+        return self.compact(~deposited) if deposited.any() else self.take(slice(0, 0))
+
+    def take(self, index):
+        """Return a new ParticleArray holding a copy of the selected particles"""
+        subset = ParticleArray.__new__(ParticleArray)
+        for name in self.COLUMNS:
+            setattr(subset, name, getattr(self, name)[index])
+        subset.next_id = self.next_id
+        return subset
+
+    def compact(self, keep):
+        """Keep only the particles selected by a boolean mask and return the others"""
+        dropped = self.take(~keep)
+        for name in self.COLUMNS:
+            setattr(self, name, getattr(self, name)[keep])
+        return dropped
+
+    def append(self, other):
+        """Add the particles of another ParticleArray to this one"""
+        for name in self.COLUMNS:
+            setattr(self, name, np.concatenate((getattr(self, name), getattr(other, name))))
+        if len(other):
+            self.next_id = max(self.next_id, int(other.id.max()) + 1)
+
+    def adapt_resolution(self, x_edges, y_edges, target_per_cell=None, total_target=None,
+                         layer_thickness=25.0, settling_tolerance=0.1):
+        """Split particles in sparse cells and merge pairs in crowded ones
+
+        Particles are counted per horizontal cell. In cells holding more
+        than twice the target count, pairs are merged towards the target, at
+        most halving the cell per call. Only particles in the same vertical
+        layer (layer_thickness metres) and the same settling class are
+        paired, nearest in height first, so merging neither moves mass
+        between layers nor turns passive tracers into settling particles.
+        Settling classes are passive tracers (zero settling velocity) and
+        logarithmic bins of settling velocity settling_tolerance wide in
+        relative terms. A merged particle carries the summed mass and the
+        mass-weighted mean position, age and settling velocity; the merges
+        of a cell are spread evenly over its layers and classes.
+
+        In cells holding fewer than half the target, every particle is split
+        in two with half the mass each, the copy getting a new id so that it
+        draws its own random numbers from then on. Total mass is conserved
+        exactly, and cells within a factor of two of the target are left alone.
+
+        Args:
+            x_edges, y_edges: Cell boundaries (m); particles outside are left alone
+            target_per_cell: Desired particles per occupied cell
+            total_target: Alternatively, the desired total count, spread
+                evenly over the currently occupied cells
+            layer_thickness: Height (m) of the layers within which particles may merge
+            settling_tolerance: Relative width of the settling velocity classes
+
+        Returns:
+            (number of particles split, number of pairs merged)
+        """
+        nx, ny = len(x_edges) - 1, len(y_edges) - 1
+        ix = np.searchsorted(x_edges, self.x, side='right') - 1
+        iy = np.searchsorted(y_edges, self.y, side='right') - 1
+        inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        cell = np.where(inside, iy * nx + ix, 0)
+
+        counts = np.bincount(cell[inside], minlength=nx * ny)
+        if target_per_cell is None:
+            target_per_cell = total_target / max(np.count_nonzero(counts), 1)
+        target = max(target_per_cell, 1)
+        count = np.where(inside, counts[cell], 0)
+
+        # Merge candidates: particles of crowded cells, grouped by cell,
+        # layer and settling class, sorted by height within each group
+        crowded = np.flatnonzero(count > 2 * target)
+        velocity = self.settling_velocity[crowded]
+        settles = velocity > 0
+        velocity_class = np.zeros(len(crowded), dtype=np.int64)
+        velocity_class[settles] = np.floor(np.log(velocity[settles]) / np.log1p(settling_tolerance))
+        layer = np.floor(self.z[crowded] / layer_thickness).astype(np.int64)
+        keys = (cell[crowded], layer, settles, velocity_class)
+        sort = np.lexsort((self.z[crowded],) + keys[::-1])
+        order = crowded[sort]
+        keys = [key[sort] for key in keys]
+
+        # Candidate pairs: consecutive particles of the same group
+        new_group = np.zeros(len(order), dtype=bool)
+        new_group[:1] = True
+        for key in keys:
+            new_group[1:] |= key[1:] != key[:-1]
+        starts = np.flatnonzero(new_group)
+        sizes = np.diff(np.r_[starts, len(order)])
+        rank = np.arange(len(order)) - np.repeat(starts, sizes)
+        first = np.flatnonzero((rank % 2 == 0) & (rank + 1 < np.repeat(sizes, sizes)))
+
+        # Take as many pairs per cell as needed, lowest pair rank first, so
+        # every group of the cell gives up about the same share
+        pair_cells = keys[0][first]
+        pair_order = np.lexsort((rank[first], pair_cells))
+        first, pair_cells = first[pair_order], pair_cells[pair_order]
+        cell_starts = np.flatnonzero(np.r_[True, pair_cells[1:] != pair_cells[:-1]]) if len(first) \
+            else np.array([], int)
+        pair_rank = np.arange(len(first)) - np.repeat(cell_starts, np.diff(np.r_[cell_starts, len(first)]))
+        merges_in_cell = np.minimum(counts[pair_cells] - int(np.ceil(target)), counts[pair_cells] // 2)
+        first = first[pair_rank < merges_in_cell]
+        a, b = order[first], order[first + 1]
+
+        ma, mb = self.mass[a], self.mass[b]
+        total = ma + mb
+        for name in ('x', 'y', 'z', 'age', 'release_time', 'settling_velocity'):
+            column = getattr(self, name)
+            column[a] = (column[a] * ma + column[b] * mb) / total
+        self.mass[a] = total
+
+        # Split: halve every particle of a sparse cell and add its twin
+        sparse = np.flatnonzero(inside & (count < target / 2))
+        self.mass[sparse] /= 2
+        twins = self.take(sparse)
+        twins.id = self.next_id + np.arange(len(sparse))
+        self.next_id += len(sparse)
+
+        if len(b):
+            keep = np.ones(len(self), dtype=bool)
+            keep[b] = False
+            self.compact(keep)
+        self.append(twins)
+        return len(sparse), len(b)
+
+    def snapshot(self, hour_of_day):
+        """Return an (N, 5) array of (x, y, z, age, hour_of_day) rows for visualize_dispersion"""
+        return np.column_stack((self.x, self.y, self.z, self.age, np.full(len(self), float(hour_of_day))))
@@ -1,12 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
 def run_dispersion_simulation(
     duration_hours=24,
     dt=0.1,
     num_particles=1000,
     release_location=(0, 0, 10),
     grid_size=(50, 50),
-    domain_size=(10000, 10000)  # 10km x 10km
+    domain_size=(10000, 10000),  # 10km x 10km
+    settling_velocity=0.0,  # m/s, scalar or one value per particle
+    particles=None,
+    met=None,
+    seed=None,
+    workers=1,
+    transition_age=None,  # hours
+    transition_spread=None,  # m
+    adapt_interval=None,  # steps between particle splitting/merging
+    target_per_cell=None,
+    receptors=None,
+    sample_interval=1,  # steps between receptor samples
+    store_positions=True,
+    state=None,
+    checkpoint_path=None,
+    checkpoint_interval=None,  # steps between checkpoints
+    return_deposition=False,
+    return_far_field=False
 ):
-    """Run a Lagrangian dispersion simulation"""
+    """Run a Lagrangian dispersion simulation
+    
+    Particles are advanced together as a ParticleArray. Particles with a
+    settling velocity sink, and those reaching the ground are removed and
+    accumulated on a DepositionGrid over the model grid. Pass a prepared
+    ParticleArray (e.g. ParticleArray.from_dust_population) to release
+    particles with their own masses and settling velocities.
+    
+    Winds come from a MetProvider (by default calculate_wind_field on a
+    24 h cycle, cached per hour) and are interpolated to each particle.
+    
+    With a seed, random displacements come from a CounterRNG keyed by
+    particle id and step, so runs are reproducible and identical for any
+    number of workers; otherwise the global np.random state is used.
+    workers > 1 updates the particle arrays in chunks on a thread pool.
+    
+    Hybrid mode (transition_age and/or transition_spread set): particles
+    older than transition_age, or the whole plume once the horizontal
+    standard deviation of its positions exceeds transition_spread, are
+    converted into mass on a ConcentrationGrid over the model grid and
+    carried on by the grid solver. The near field stays Lagrangian while
+    the far-field cost no longer depends on the particle count.
+    
+    Adaptive resolution (adapt_interval set): every adapt_interval steps
+    particles in sparse grid cells are split and those in crowded cells
+    merged, towards target_per_cell particles per occupied cell (default:
+    the number released spread over the occupied cells, which keeps the
+    total roughly constant). Only particles in the same vertical layer and
+    settling class are merged, and mass is conserved exactly.
+    
+    Receptors (a ReceptorNetwork) are sampled every sample_interval steps,
+    including the far field in hybrid mode; their time series are kept on
+    the network. With store_positions=False no particle history is kept,
+    and particle_positions is returned empty.
+    
+    The evolving model state (particles, time, random numbers, deposition,
+    far field and receptor series) lives in a DispersionState. With
+    checkpoint_path and checkpoint_interval set, it is checkpointed every
+    checkpoint_interval steps in the background. To resume, pass
+    state=DispersionState.load(checkpoint_path) with the same settings
+    otherwise; the run continues to duration_hours along exactly the
+    trajectory of an uninterrupted run (the state supersedes particles,
+    seed and receptors). Returned particle_positions then start at the
+    resume point.
+    
+    Returns particle_positions, x_grid, y_grid, followed by the
+    DepositionGrid when return_deposition is True and the far-field
+    ConcentrationGrid when return_far_field is True.
+    particle_positions holds one (N, 5) array of (x, y, z, age,
+    hour_of_day) rows per step, for the particles still tracked.
+    """
     
     # Initialize grid
     x_grid, y_grid = np.meshgrid(
@@ -14,41 +84,92 @@ def run_dispersion_simulation(
         np.linspace(0, domain_size[1], grid_size[1])
     )
     
-    # Initialize particles (all released at t=0 for simplicity)
-    particles = [
-        Particle(release_location[0], release_location[1], release_location[2], 0)
-        for _ in range(num_particles)
-    ]
+    # Weather model, evaluated once per cached frame
+    if met is None:
+        met = AnalyticMetProvider(calculate_wind_field, x_grid, y_grid)
+    
+    # Initialize particles (all released at t=0 for simplicity), or resume
+    if state is None:
+        if particles is None:
+            particles = ParticleArray.release(
+                num_particles, release_location, settling_velocity=settling_velocity
+            )
+        state = DispersionState.start(particles, x_grid, y_grid, receptors, seed)
+    else:
+        state.restore_random_state()
+    
+    # Parallel particle updates
+    executor = ThreadPoolExecutor(workers) if workers > 1 else None
     
     # Storage for results
     particle_positions = []
-
-    # Time loop
-    current_hour = 0
-    while current_hour < duration_hours:
-        # Get current hour of day (0-23)
-        hour_of_day = current_hour % 24
-        
-        # Update Eulerian weather model
-        u, v = calculate_wind_field(x_grid, y_grid, hour_of_day)
-        stability = calculate_stability_parameters(hour_of_day)
-        
-        # Interpolate wind at particle locations
-        # (In a real model, you'd use proper interpolation)
-        u_at_particles = u[0, 0]  # Simplified
-        v_at_particles = v[0, 0]  # Simplified
-        
-        # Update each particle
-        for particle in particles:
-            particle.update_position(u_at_particles, v_at_particles, stability, dt)
-        
-        # Store current state
-        particle_positions.append([
-            (p.x, p.y, p.z, p.age, hour_of_day)
-            for p in particles
-        ])
-
-        # Increment time
-        current_hour += dt
+    hybrid = transition_age is not None or transition_spread is not None
+    
+    # Time loop; the worker threads and the checkpoint writer are
+    # stopped even if a step fails
+    try:
+        while state.current_hour < duration_hours:
+            particles = state.particles
+            current_hour = state.current_hour
+            step = state.step
+            
+            # Get current hour of day (0-23)
+            hour_of_day = current_hour % 24
+            
+            # Eulerian weather model at the current time
+            stability = met.stability(current_hour)
+            
+            # Interpolate wind at particle locations
+            u_at_particles, v_at_particles = met.wind_at(current_hour, particles.x, particles.y, particles.z)
+            
+            # Update all particles; deposited ones leave the arrays
+            deposited = particles.update_positions(
+                u_at_particles, v_at_particles, stability, dt, rng=state.rng, step=step, executor=executor
+            )
+            state.deposition.add(deposited.x, deposited.y, deposited.mass)
+            
+            # Hybrid mode: advance the far field, then hand over particles that qualify
+            if hybrid:
+                state.far_field.step(met, current_hour, stability, dt)
+                transition = np.zeros(len(particles), dtype=bool)
+                if transition_age is not None:
+                    transition |= particles.age >= transition_age
+                if (transition_spread is not None and len(particles) > 1
+                        and max(particles.x.std(), particles.y.std()) > transition_spread):
+                    transition[:] = True
+                if transition.any():
+                    converted = particles.compact(~transition)
+                    state.far_field.add_particles(converted.x, converted.y, converted.mass)
+            
+            # Adaptive resolution: split sparse cells, merge crowded ones
+            if adapt_interval and (step + 1) % adapt_interval == 0:
+                particles.adapt_resolution(
+                    x_grid[0, :], y_grid[:, 0], target_per_cell, total_target=state.num_released
+                )
+            
+            # Sample the receptor network
+            if state.receptors is not None and (step + 1) % sample_interval == 0:
+                state.receptors.sample(current_hour + dt, particles, state.far_field, stability['mixing_height'])
+            
+            # Store current state
+            if store_positions:
+                particle_positions.append(particles.snapshot(hour_of_day))
+            
+            # Increment time
+            state.current_hour += dt
+            state.step += 1
+            
+            # Checkpoint in the background while the next steps run
+            if checkpoint_path and checkpoint_interval and state.step % checkpoint_interval == 0:
+                state.save_async(checkpoint_path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        state.close()
     
-    return particle_positions, x_grid, y_grid
\ No newline at end of file
+    results = (particle_positions, x_grid, y_grid)
+    if return_deposition:
+        results += (state.deposition,)
+    if return_far_field:
+        results += (state.far_field,)
+    return results
\ No newline at end of file
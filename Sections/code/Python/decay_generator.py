@@ -0,0 +1,614 @@
+from dataclasses import dataclass
+from multiprocessing import Pool
+from tempfile import TemporaryDirectory
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import os
+import numpy as np
+
+from tsm import Particle, StandardModel
+from conservation_laws import ConservationChecker
+from four_vectors import boost
+
+# Physical constants
+SPEED_OF_LIGHT = 299792458.0  # m/s
+HBAR_GEV_S = 6.582119569e-25  # ħ in GeV·s
+
+# One row per particle; rows of an event are contiguous and parents precede children
+EVENT_DTYPE = np.dtype([
+    ("event", "<u4"),   # event number
+    ("pid", "<i2"),     # catalog id (see DecayGenerator.particles)
+    ("parent", "<i4"),  # row of the parent within the same batch, -1 for the primary
+    ("status", "u1"),   # STATUS_FINAL or STATUS_DECAYED
+    ("E", "<f8"),       # energy in GeV
+    ("px", "<f8"),      # momentum in GeV/c
+    ("py", "<f8"),
+    ("pz", "<f8"),
+    ("x", "<f4"),       # production vertex in meters
+    ("y", "<f4"),
+    ("z", "<f4"),
+    ("t", "<f4"),       # production time in seconds
+])
+
+STATUS_FINAL = 1
+STATUS_DECAYED = 2
+
+
+@dataclass(frozen=True)
+class DecayChannel:
+    """A decay mode: product particle names and the branching ratio."""
+    
+    products: Tuple[str, ...]
+    branching_ratio: float
+
+
+class DecayTable:
+    """
+    Lifetimes and decay channels attached to catalog particles.
+    
+    Catalog particles are immutable, so the table maps them to their decay
+    data instead of storing it on the particles. Every channel is checked for
+    charge, lepton-number, baryon-number and color conservation and for
+    being kinematically open.
+    """
+    
+    def __init__(self, model: StandardModel):
+        """
+        Initialize an empty decay table.
+        
+        Args:
+            model: The catalog that particle names are resolved against
+        """
+        self.model = model
+        self._checker = ConservationChecker(model)
+        self._entries: Dict[Particle, Tuple[float, List[DecayChannel]]] = {}
+    
+    def add(self, name: str, lifetime_s: float, channels: Sequence[DecayChannel],
+            conjugate: bool = True) -> None:
+        """
+        Attach a lifetime and decay channels to a particle.
+        
+        Branching ratios are normalized to sum to one.
+        
+        Args:
+            name: Name of the decaying particle
+            lifetime_s: Mean proper lifetime in seconds
+            channels: Decay channels of the particle
+            conjugate: Also add the charge-conjugate decays to the antiparticle
+        """
+        particle = self._particle(name)
+        if lifetime_s <= 0:
+            raise ValueError(f"Lifetime must be positive: {lifetime_s}")
+        total = sum(c.branching_ratio for c in channels)
+        if total <= 0:
+            raise ValueError(f"{name} needs at least one channel with a positive branching ratio")
+        
+        normalized = []
+        for channel in channels:
+            products = [self._particle(p) for p in channel.products]
+            if not 2 <= len(products) <= 3:
+                raise ValueError(f"Only two- and three-body decays are supported: {channel.products}")
+            if sum(p.mass_gev for p in products) >= particle.mass_gev:
+                raise ValueError(f"{name} → {' '.join(channel.products)} is kinematically closed")
+            incoming = self._checker.ids_of([particle], width=3)[np.newaxis]
+            outgoing = self._checker.ids_of(products, width=3)[np.newaxis]
+            if not self._checker.is_allowed(incoming, outgoing)[0]:
+                raise ValueError(f"{name} → {' '.join(channel.products)} violates a conservation law")
+            normalized.append(DecayChannel(tuple(channel.products), channel.branching_ratio / total))
+        self._entries[particle] = (lifetime_s, normalized)
+        
+        anti = particle.get_antiparticle()
+        if conjugate and anti is not particle and self.model.get_particle_by_name(anti.name) is not None:
+            conjugated = [DecayChannel(tuple(self._conjugate_name(p) for p in c.products), c.branching_ratio)
+                          for c in normalized]
+            self.add(anti.name, lifetime_s, conjugated, conjugate=False)
+    
+    def lifetime(self, particle: Particle) -> float:
+        """Return the mean proper lifetime in seconds (infinite for stable particles)."""
+        entry = self._entries.get(particle)
+        return entry[0] if entry else float("inf")
+    
+    def channels(self, particle: Particle) -> List[DecayChannel]:
+        """Return the decay channels of a particle (empty for stable particles)."""
+        entry = self._entries.get(particle)
+        return list(entry[1]) if entry else []
+    
+    def _particle(self, name: str) -> Particle:
+        """Resolve a particle name against the catalog."""
+        particle = self.model.get_particle_by_name(name)
+        if particle is None:
+            raise KeyError(f"Unknown particle: {name}")
+        return particle
+    
+    def _conjugate_name(self, name: str) -> str:
+        """Return the name of the charge conjugate of a particle."""
+        particle = self._particle(name)
+        if particle.name == "W Plus":
+            return "W Minus"
+        if particle.name == "W Minus":
+            return "W Plus"
+        return particle.get_antiparticle().name
+    
+    @classmethod
+    def standard(cls, model: StandardModel) -> 'DecayTable':
+        """
+        Build a table of tree-level Standard Model decays.
+        
+        Quarks (other than top) and gluons are treated as stable since
+        hadronization is not modeled. Widths and branching ratios are
+        rounded PDG values; off-shell modes such as H → WW* are omitted.
+        """
+        table = cls(model)
+        C = DecayChannel
+        
+        table.add("Muon", 2.1969811e-6, [
+            C(("Electron", "Anti-Electron Neutrino", "Muon Neutrino"), 1.0),
+        ])
+        table.add("Tau", 2.903e-13, [
+            C(("Electron", "Anti-Electron Neutrino", "Tau Neutrino"), 0.1782),
+            C(("Muon", "Anti-Muon Neutrino", "Tau Neutrino"), 0.1739),
+            C(("Tau Neutrino", "Down", "Anti-Up"), 0.6479),
+        ])
+        w_plus = [
+            C(("Anti-Electron", "Electron Neutrino"), 0.1071),
+            C(("Anti-Muon", "Muon Neutrino"), 0.1063),
+            C(("Anti-Tau", "Tau Neutrino"), 0.1138),
+            C(("Up", "Anti-Down"), 0.3350),
+            C(("Charm", "Anti-Strange"), 0.3378),
+        ]
+        w_lifetime = HBAR_GEV_S / 2.085
+        table.add("W Plus", w_lifetime, w_plus, conjugate=False)
+        table.add("W Minus", w_lifetime, [
+            C(tuple(table._conjugate_name(p) for p in c.products), c.branching_ratio) for c in w_plus
+        ], conjugate=False)
+        table.add("Z", HBAR_GEV_S / 2.4952, [
+            C(("Electron", "Anti-Electron"), 0.03363),
+            C(("Muon", "Anti-Muon"), 0.03366),
+            C(("Tau", "Anti-Tau"), 0.03370),
+            C(("Electron Neutrino", "Anti-Electron Neutrino"), 0.0667),
+            C(("Muon Neutrino", "Anti-Muon Neutrino"), 0.0667),
+            C(("Tau Neutrino", "Anti-Tau Neutrino"), 0.0667),
+            C(("Up", "Anti-Up"), 0.116),
+            C(("Charm", "Anti-Charm"), 0.120),
+            C(("Down", "Anti-Down"), 0.156),
+            C(("Strange", "Anti-Strange"), 0.156),
+            C(("Bottom", "Anti-Bottom"), 0.151),
+        ])
+        table.add("Higgs", HBAR_GEV_S / 3.2e-3, [
+            C(("Bottom", "Anti-Bottom"), 0.582),
+            C(("Gluon", "Gluon"), 0.0818),
+            C(("Tau", "Anti-Tau"), 0.0627),
+            C(("Charm", "Anti-Charm"), 0.0289),
+            C(("Photon", "Photon"), 0.00227),
+            C(("Muon", "Anti-Muon"), 0.000218),
+        ])
+        table.add("Top", HBAR_GEV_S / 1.42, [
+            C(("W Plus", "Bottom"), 1.0),
+        ])
+        return table
+
+
+def _two_body_momentum(parent_mass: np.ndarray, m1: np.ndarray, m2: np.ndarray) -> np.ndarray:
+    """Return the daughter momentum in the parent rest frame for a two-body decay."""
+    s = parent_mass ** 2
+    value = (s - (m1 + m2) ** 2) * (s - (m1 - m2) ** 2)
+    return np.sqrt(np.maximum(value, 0.0)) / (2 * parent_mass)
+
+
+def _isotropic_directions(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Return n unit vectors distributed uniformly on the sphere."""
+    cos_theta = rng.uniform(-1.0, 1.0, n)
+    phi = rng.uniform(-np.pi, np.pi, n)
+    sin_theta = np.sqrt(1 - cos_theta ** 2)
+    
+    # sin φ from cos φ and the sign of φ: one trigonometric call instead of two
+    cos_phi = np.cos(phi)
+    sin_phi = np.copysign(np.sqrt(1 - cos_phi ** 2), phi)
+    directions = np.empty((n, 3))
+    np.multiply(sin_theta, cos_phi, out=directions[:, 0])
+    np.multiply(sin_theta, sin_phi, out=directions[:, 1])
+    directions[:, 2] = cos_theta
+    return directions
+
+
+def _back_to_back(rng: np.random.Generator, momentum: np.ndarray,
+                  m1: np.ndarray, m2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return isotropic back-to-back four-momenta with the given momentum magnitude."""
+    p = _isotropic_directions(rng, len(momentum)) * momentum[:, np.newaxis]
+    first = np.empty((len(momentum), 4))
+    second = np.empty((len(momentum), 4))
+    first[:, 0] = np.sqrt(m1 ** 2 + momentum ** 2)
+    first[:, 1:] = p
+    second[:, 0] = np.sqrt(m2 ** 2 + momentum ** 2)
+    second[:, 1:] = -p
+    return first, second
+
+
+def two_body_decay(rng: np.random.Generator, parent_mass: np.ndarray,
+                   m1: np.ndarray, m2: np.ndarray) -> List[np.ndarray]:
+    """
+    Sample isotropic two-body decays in the parent rest frame.
+    
+    Returns:
+        The (n, 4) four-momenta of both daughters
+    """
+    momentum = _two_body_momentum(parent_mass, m1, m2)
+    return list(_back_to_back(rng, momentum, m1, m2))
+
+
+def _phase_space_weight(parent_mass: np.ndarray, m12: np.ndarray, m1: np.ndarray,
+                        m2: np.ndarray, m3: np.ndarray) -> np.ndarray:
+    """Return the three-body phase-space weight p*(M → m12 m3) · p*(m12 → m1 m2)."""
+    return _two_body_momentum(parent_mass, m12, m3) * _two_body_momentum(m12, m1, m2)
+
+
+def phase_space_weight_max(parent_mass: float, m1: float, m2: float, m3: float) -> float:
+    """
+    Return an upper bound of the three-body phase-space weight for fixed masses.
+    
+    The weight is maximized on a fine grid of the (12) subsystem mass and
+    given a 1% margin, which is much tighter than the product of the two
+    momentum maxima and so needs fewer accept-reject trials.
+    """
+    m12 = np.linspace(m1 + m2, parent_mass - m3, 4097)
+    return 1.01 * float(_phase_space_weight(parent_mass, m12, m1, m2, m3).max())
+
+
+def three_body_decay(rng: np.random.Generator, parent_mass: np.ndarray,
+                     m1: np.ndarray, m2: np.ndarray, m3: np.ndarray,
+                     weight_max: Optional[np.ndarray] = None) -> List[np.ndarray]:
+    """
+    Sample three-body decays uniformly in phase space, in the parent rest frame.
+    
+    The (12) subsystem mass is drawn by accept-reject on the phase-space
+    weight p*(M → m12 m3) · p*(m12 → m1 m2); the (12) system and particle 3
+    are then emitted back to back and 1 and 2 decay isotropically in the
+    (12) rest frame. No matrix element is applied.
+    
+    Args:
+        weight_max: Upper bound of the weight (default: the product of the two momentum maxima)
+    
+    Returns:
+        The (n, 4) four-momenta of the three daughters
+    """
+    n = len(parent_mass)
+    low = m1 + m2
+    high = parent_mass - m3
+    if weight_max is None:
+        weight_max = (_two_body_momentum(parent_mass, low, m3)
+                      * _two_body_momentum(high, m1, m2))
+    weight_max = np.broadcast_to(weight_max, (n,))
+    
+    m12 = np.empty(n)
+    pending = np.arange(n)
+    while pending.size:
+        trial = rng.uniform(low[pending], high[pending])
+        weight = _phase_space_weight(parent_mass[pending], trial, m1[pending], m2[pending], m3[pending])
+        accepted = rng.random(pending.size) * weight_max[pending] <= weight
+        m12[pending[accepted]] = trial[accepted]
+        pending = pending[~accepted]
+    
+    pair, third = _back_to_back(rng, _two_body_momentum(parent_mass, m12, m3), m12, m3)
+    first, second = _back_to_back(rng, _two_body_momentum(m12, m1, m2), m1, m2)
+    beta = pair[:, 1:] / pair[:, :1]
+    first = boost(first, beta)
+    
+    # The (12) system is the sum of 1 and 2, so 2 needs no boost of its own
+    return [first, pair - first, third]
+
+
+@dataclass(frozen=True)
+class _Channels:
+    """The decay channels of one species, compiled to catalog ids."""
+    
+    cumulative: np.ndarray                 # cumulative branching ratios
+    products: Tuple[Tuple[int, ...], ...]  # product ids per channel
+    weight_max: Tuple[float, ...]          # three-body weight bound per channel (0 for two-body)
+
+
+@dataclass(frozen=True)
+class _CompiledDecays:
+    """The lookup arrays a batch needs: plain numbers, cheap to send to worker processes."""
+    
+    masses: np.ndarray
+    lifetimes: np.ndarray
+    channels: Dict[int, _Channels]
+    seed: int
+    max_depth: int
+
+
+@dataclass
+class _Generation:
+    """The rows of one decay generation of a batch, in event order."""
+    
+    event: np.ndarray   # event index within the batch
+    pid: np.ndarray
+    parent: Optional[np.ndarray]  # row of the parent in the previous generation
+    p4: np.ndarray
+    vertex: np.ndarray  # (t, x, y, z) of production
+    decayed: Optional[np.ndarray] = None  # rows that decay into the next generation
+
+
+def _decay_generation(decays: _CompiledDecays, rng: np.random.Generator,
+                      generation: _Generation, unstable: np.ndarray) -> _Generation:
+    """
+    Decay the unstable rows of a generation.
+    
+    The daughters of a row are stored together, in the order of their
+    parents, so the new generation is again in event order.
+    """
+    if unstable.size == len(generation.pid):
+        pid, parent_p4, decay_vertex = generation.pid, generation.p4, generation.vertex.copy()
+    else:
+        pid, parent_p4, decay_vertex = generation.pid[unstable], generation.p4[unstable], generation.vertex[unstable]
+    mass = decays.masses[pid]
+    moving = bool(parent_p4[:, 1:].any())
+    
+    # Decay vertex: exponential proper time, dilated and displaced in the lab
+    proper_time = rng.exponential(decays.lifetimes[pid])
+    decay_vertex[:, 0] += parent_p4[:, 0] / mass * proper_time
+    if moving:
+        decay_vertex[:, 1:] += parent_p4[:, 1:] * (SPEED_OF_LIGHT * proper_time / mass)[:, np.newaxis]
+    
+    # Draw the channels and number the (species, channel) groups; a stable
+    # sort on the group number lists each group's rows in parent order
+    groups: List[Tuple[int, int]] = []
+    group = np.empty(unstable.size, dtype=np.uint16)
+    species_counts = np.bincount(pid)
+    species_present = np.flatnonzero(species_counts)
+    for species in species_present:
+        rows = pid == species if species_present.size > 1 else slice(None)
+        channels = decays.channels[int(species)]
+        if len(channels.products) == 1:
+            group[rows] = len(groups)
+        else:
+            u = rng.random(species_counts[species])
+            group[rows] = len(groups) + np.searchsorted(channels.cumulative, u, side="right")
+        groups.extend((int(species), channel) for channel in range(len(channels.products)))
+    group_sizes = np.bincount(group, minlength=len(groups))
+    by_group = np.argsort(group, kind="stable") if len(groups) > 1 else np.arange(unstable.size)
+    
+    # Reserve consecutive daughter rows for each parent
+    n_daughters = np.array([len(decays.channels[species].products[channel])
+                            for species, channel in groups])[group]
+    first_daughter = np.cumsum(n_daughters) - n_daughters
+    n_rows = int(n_daughters.sum())
+    
+    daughter_pid = np.empty(n_rows, dtype=np.int16)
+    daughter_p4 = np.empty((n_rows, 4))
+    end = 0
+    for (species, channel), size in zip(groups, group_sizes):
+        if size == 0:
+            continue
+        picked = by_group[end:end + size]
+        end += size
+        channels = decays.channels[species]
+        products = channels.products[channel]
+        masses = [np.full(picked.size, decays.masses[p]) for p in products]
+        parent_mass = np.full(picked.size, decays.masses[species])
+        if len(products) == 2:
+            daughters = two_body_decay(rng, parent_mass, *masses)
+        else:
+            daughters = three_body_decay(rng, parent_mass, *masses, weight_max=channels.weight_max[channel])
+        
+        if moving:
+            # Boost all daughters but the last, which takes the rest of the parent's four-momentum
+            group_p4 = parent_p4[picked]
+            beta = group_p4[:, 1:] / group_p4[:, :1]
+            daughters = [boost(daughter, beta) for daughter in daughters[:-1]]
+            daughters.append(group_p4 - sum(daughters))
+        for i, (product, daughter) in enumerate(zip(products, daughters)):
+            # With a single group every parent has the same number of daughters
+            slots = slice(i, None, len(products)) if len(groups) == 1 else first_daughter[picked] + i
+            daughter_pid[slots] = product
+            daughter_p4[slots] = daughter
+    
+    return _Generation(np.repeat(generation.event[unstable], n_daughters), daughter_pid,
+                       np.repeat(unstable, n_daughters), daughter_p4,
+                       np.repeat(decay_vertex, n_daughters, axis=0))
+
+
+def _generate_batch(decays: _CompiledDecays, parent_id: int, block: int, n_events: int,
+                    first_event: int, momentum: Tuple[float, float, float],
+                    path: Optional[str] = None) -> np.ndarray:
+    """
+    Generate one batch of events with the batch's own random stream.
+    
+    Args:
+        path: Write the rows to a memory-mapped file here instead of to memory
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(decays.seed, spawn_key=(block,)))
+    
+    p4 = np.empty((n_events, 4))
+    p4[:, 1:] = momentum
+    p4[:, 0] = np.sqrt(decays.masses[parent_id] ** 2 + np.dot(momentum, momentum))
+    generations = [_Generation(np.arange(n_events), np.full(n_events, parent_id, dtype=np.int16),
+                               None, p4, np.zeros((n_events, 4)))]
+    for _ in range(decays.max_depth):
+        current = generations[-1]
+        unstable = np.flatnonzero(np.isfinite(decays.lifetimes[current.pid]))
+        if unstable.size == 0:
+            break
+        current.decayed = unstable
+        generations.append(_decay_generation(decays, rng, current, unstable))
+    
+    # Rows of an event are its rows of each generation in turn; with every
+    # generation in event order, the output row of each row follows from
+    # per-event counts and no sort is needed
+    counts = [np.bincount(g.event, minlength=n_events) for g in generations]
+    next_row = np.cumsum(sum(counts)) - sum(counts)
+    n_rows = sum(len(g.pid) for g in generations)
+    if path is None:
+        out = np.empty(n_rows, dtype=EVENT_DTYPE)
+    else:
+        out = np.memmap(path, dtype=EVENT_DTYPE, mode="w+", shape=(n_rows,))
+    parent_rows = None
+    for generation, count in zip(generations, counts):
+        first_in_generation = np.cumsum(count) - count
+        rows = (next_row - first_in_generation)[generation.event] + np.arange(len(generation.pid))
+        next_row += count
+        
+        block_rows = np.empty(len(rows), dtype=EVENT_DTYPE)
+        block_rows["event"] = generation.event + first_event
+        block_rows["pid"] = generation.pid
+        block_rows["parent"] = -1 if parent_rows is None else parent_rows[generation.parent]
+        block_rows["status"] = STATUS_FINAL
+        if generation.decayed is not None:
+            block_rows["status"][generation.decayed] = STATUS_DECAYED
+        block_rows["E"] = generation.p4[:, 0]
+        block_rows["px"] = generation.p4[:, 1]
+        block_rows["py"] = generation.p4[:, 2]
+        block_rows["pz"] = generation.p4[:, 3]
+        block_rows["t"] = generation.vertex[:, 0]
+        block_rows["x"] = generation.vertex[:, 1]
+        block_rows["y"] = generation.vertex[:, 2]
+        block_rows["z"] = generation.vertex[:, 3]
+        # Copy whole rows as opaque bytes: much faster than a structured scatter
+        out.view(np.void)[rows] = block_rows.view(np.void)
+        parent_rows = rows
+    return out
+
+
+# Batches travel from workers to the parent as files in RAM where available
+_BATCH_DIRECTORY: Optional[str] = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Lookup arrays and batch directory of a worker process, set once by the Pool initializer
+_worker_decays: Optional[_CompiledDecays] = None
+_worker_directory: Optional[str] = None
+
+
+def _batch_path(directory: str, block: int) -> str:
+    """Return the file a worker writes batch ``block`` to."""
+    return os.path.join(directory, f"batch{block}.events")
+
+
+def _init_worker(decays: _CompiledDecays, directory: str) -> None:
+    """Pool initializer: keep the compiled lookup arrays for all tasks of this worker."""
+    global _worker_decays, _worker_directory
+    _worker_decays = decays
+    _worker_directory = directory
+
+
+def _generate_batch_task(task: Tuple) -> Tuple[int, int]:
+    """
+    Generate the batch described by a plain task tuple with the worker's lookup arrays.
+    
+    The rows are written to the batch's file rather than pickled back to the
+    parent; only the block number and row count are returned.
+    """
+    block = task[1]
+    return block, len(_generate_batch(_worker_decays, *task, path=_batch_path(_worker_directory, block)))
+
+
+def _receive_batch(directory: str, block: int, n_rows: int) -> np.ndarray:
+    """Map a batch written by a worker and remove its file; the mapping keeps the rows."""
+    path = _batch_path(directory, block)
+    batch = np.memmap(path, dtype=EVENT_DTYPE, mode="r+", shape=(n_rows,)).view(np.ndarray)
+    if os.name == "nt":
+        # Windows cannot remove a file that is still mapped
+        batch = batch.copy()
+    os.remove(path)
+    return batch
+
+
+class DecayGenerator:
+    """
+    Vectorized Monte Carlo generator of decay chains.
+    
+    Events are generated in fixed-size batches. Each batch decays all
+    unstable particles of one generation together: channels are drawn per
+    species from cumulative branching ratios, kinematics for each channel
+    are sampled as whole arrays, and the daughters are boosted into the lab
+    frame and placed at the parent's decay vertex. Batch ``b`` draws from its
+    own seed stream derived from ``seed``, so the output does not depend on
+    how batches are spread over processes. Worker processes receive the
+    compiled lookup arrays once, through the Pool initializer, and then only
+    small task tuples of ids and counts; they write finished batches to
+    memory-mapped files, which the parent maps instead of unpickling.
+    """
+    
+    def __init__(self, table: DecayTable, seed: int = 0, max_depth: int = 10):
+        """
+        Compile a decay table into lookup arrays.
+        
+        Args:
+            table: Decay data for the catalog particles
+            seed: Base seed of all batch random streams
+            max_depth: Maximum number of decay generations per event
+        """
+        self.particles: List[Particle] = list(table.model.particles)
+        ids: Dict[Particle, int] = {}
+        for i, particle in enumerate(self.particles):
+            ids.setdefault(particle, i)
+        self.seed = seed
+        self.max_depth = max_depth
+        
+        self.masses = np.array([p.mass_gev for p in self.particles])
+        self.lifetimes = np.array([table.lifetime(p) for p in self.particles])
+        
+        # Per-species cumulative branching ratios, product ids and three-body weight bounds
+        channels: Dict[int, _Channels] = {}
+        for particle in self.particles:
+            decays = table.channels(particle)
+            if decays:
+                cumulative = np.cumsum([c.branching_ratio for c in decays])
+                cumulative[-1] = 1.0
+                products = tuple(tuple(ids[table.model.get_particle_by_name(name)] for name in c.products)
+                                 for c in decays)
+                weight_max = tuple(phase_space_weight_max(particle.mass_gev, *self.masses[list(p)])
+                                   if len(p) == 3 else 0.0 for p in products)
+                channels[ids[particle]] = _Channels(cumulative, products, weight_max)
+        
+        self._compiled = _CompiledDecays(self.masses, self.lifetimes, channels, seed, max_depth)
+        self._ids = ids
+    
+    def id_of(self, particle: Particle) -> int:
+        """Return the catalog id used in the ``pid`` column."""
+        return self._ids[particle]
+    
+    def generate(self, parent: Particle, n_events: int, batch_size: int = 100_000,
+                 parent_momentum: Optional[Sequence[float]] = None,
+                 processes: int = 1) -> Iterator[np.ndarray]:
+        """
+        Stream decay-chain events as structured arrays of :data:`EVENT_DTYPE`.
+        
+        Args:
+            parent: The particle produced in every event
+            n_events: Number of events
+            batch_size: Events per yielded array (also the unit of seeding)
+            parent_momentum: Lab momentum of the parent in GeV/c (default: at rest)
+            processes: Number of worker processes; the output is the same for any value
+        
+        Yields:
+            One array per batch, in event order
+        """
+        momentum = tuple(parent_momentum) if parent_momentum is not None else (0.0, 0.0, 0.0)
+        tasks = [(self._ids[parent], block, min(batch_size, n_events - start), start, momentum)
+                 for block, start in enumerate(range(0, n_events, batch_size))]
+        
+        if processes <= 1:
+            for task in tasks:
+                yield _generate_batch(self._compiled, *task)
+            return
+        
+        with TemporaryDirectory(prefix="decays-", dir=_BATCH_DIRECTORY) as directory, \
+                Pool(processes, initializer=_init_worker, initargs=(self._compiled, directory)) as pool:
+            for block, n_rows in pool.imap(_generate_batch_task, tasks):
+                yield _receive_batch(directory, block, n_rows)
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    
+    sm = StandardModel.shared()
+    generator = DecayGenerator(DecayTable.standard(sm), seed=42)
+    
+    # One process, then one per core: the target is 10⁶ events/s
+    for processes in sorted({1, os.cpu_count() or 1}):
+        for name, n_events in (("Muon", 1_000_000), ("Z", 1_000_000), ("Top", 1_000_000)):
+            parent = sm.get_particle_by_name(name)
+            start = time.perf_counter()
+            rows = sum(len(batch) for batch in generator.generate(parent, n_events, processes=processes))
+            elapsed = time.perf_counter() - start
+            print(f"{name}, processes={processes}: {n_events:,} events ({rows:,} particles) in "
+                  f"{elapsed:.2f} s = {n_events / elapsed / 1e6:.2f} M events/s")
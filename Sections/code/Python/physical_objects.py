@@ -1,9 +1,19 @@
 from enum import Enum, auto
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple, ClassVar, Set, Union
+from functools import cached_property
+from typing import List, Optional, Dict, Any, Tuple, ClassVar, Set, Union, TypedDict
+import os
 import numpy as np
 from datetime import datetime, timedelta
 
+# Optional columnar storage backend; snapshots fall back to .npz without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
 # Type definitions for physical object properties
 class OrbitalParameters(TypedDict, total=False):
     semi_major_axis: float  # meters
@@ -56,9 +66,15 @@ class SystemType(Enum):
     def __str__(self) -> str:
         return self.name.replace('_', ' ').capitalize()
 
-@dataclass
+@dataclass(frozen=True)
 class Vector3D:
-    """A 3D vector class for position, velocity, and other physical quantities."""
+    """
+    A 3D vector class for position, velocity, and other physical quantities.
+    
+    Vectors are immutable: PhysicalObject caches quantities derived from its
+    position and velocity and drops them when a new vector is assigned, so
+    updates must replace the vector rather than edit its components.
+    """
     
     x: float = 0.0
     y: float = 0.0
@@ -158,10 +174,27 @@ class PhysicalObject:
     position: Vector3D = field(default_factory=Vector3D)
     velocity: Vector3D = field(default_factory=Vector3D)
     properties: Dict[str, Any] = field(default_factory=dict)
+    test_particle: bool = False  # Feels gravity in a PhysicalSystem but does not source it
     
     # Class constants
     GRAVITATIONAL_CONSTANT: ClassVar[float] = 6.67430e-11  # m^3 kg^-1 s^-2
     
+    # Derived quantities are cached on first access; assigning one of these
+    # attributes drops the cached values that depend on it
+    DERIVED_DEPENDENCIES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "mass_kg": ("density", "surface_gravity", "escape_velocity", "kinetic_energy"),
+        "radius_m": ("volume", "density", "surface_gravity", "escape_velocity"),
+        "velocity": ("kinetic_energy",),
+    }
+    
+    # ``properties`` entries that mirror derived quantities. They are not
+    # filled at construction (PhysicalSystem.to_columns computes them for
+    # the whole population); any copy present is dropped with the cache
+    DERIVED_PROPERTY_KEYS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "volume": ("volume_m3",),
+        "density": ("density_kg_m3",),
+    }
+    
     def __post_init__(self) -> None:
         """Initialize default properties if not provided."""
         if self.mass_kg <= 0:
@@ -175,11 +208,34 @@ class PhysicalObject:
             self.position = Vector3D.from_dict(self.position)
         if isinstance(self.velocity, dict):
             self.velocity = Vector3D.from_dict(self.velocity)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute and invalidate any cached quantities derived from it."""
+        object.__setattr__(self, name, value)
+        stale = self.DERIVED_DEPENDENCIES.get(name)
+        if stale:
+            self._drop_derived(stale)
+    
+    def invalidate_derived(self) -> None:
+        """
+        Drop all cached derived quantities.
         
-        # Calculate volume and density if radius is provided
-        if self.radius_m > 0:
-            self.properties["volume_m3"] = (4/3) * np.pi * (self.radius_m ** 3)
-            self.properties["density_kg_m3"] = self.mass_kg / self.properties["volume_m3"]
+        Needed only after editing ``properties`` or ``orbital_parameters`` in
+        place, which attribute assignment cannot see. Vectors are immutable,
+        so position and velocity changes always go through assignment.
+        """
+        for stale in self.DERIVED_DEPENDENCIES.values():
+            self._drop_derived(stale)
+    
+    def _drop_derived(self, stale: Tuple[str, ...]) -> None:
+        """Drop cached derived quantities and the ``properties`` entries mirroring them."""
+        cache = self.__dict__
+        properties = cache.get("properties")
+        for derived in stale:
+            cache.pop(derived, None)
+            if properties:
+                for key in self.DERIVED_PROPERTY_KEYS.get(derived, ()):
+                    properties.pop(key, None)
     
     def __repr__(self) -> str:
         """Return a string representation of the physical object."""
@@ -197,28 +253,28 @@ class PhysicalObject:
         """Generate a hash for using objects in sets and as dict keys."""
         return hash((self.name, self.object_type, self.mass_kg))
     
-    @property
+    @cached_property
     def volume(self) -> float:
         """Return the volume of the object in cubic meters."""
-        if "volume_m3" not in self.properties and self.radius_m > 0:
-            self.properties["volume_m3"] = (4/3) * np.pi * (self.radius_m ** 3)
-        return self.properties.get("volume_m3", 0.0)
+        if self.radius_m > 0:
+            return (4/3) * np.pi * (self.radius_m ** 3)
+        return 0.0
     
-    @property
+    @cached_property
     def density(self) -> float:
         """Return the density of the object in kg/m³."""
-        if "density_kg_m3" not in self.properties and self.volume > 0:
-            self.properties["density_kg_m3"] = self.mass_kg / self.volume
-        return self.properties.get("density_kg_m3", 0.0)
+        if self.volume > 0:
+            return self.mass_kg / self.volume
+        return 0.0
     
-    @property
+    @cached_property
     def surface_gravity(self) -> float:
         """Return the surface gravity in m/s²."""
         if self.radius_m > 0:
             return self.GRAVITATIONAL_CONSTANT * self.mass_kg / (self.radius_m ** 2)
         return 0.0
     
-    @property
+    @cached_property
     def escape_velocity(self) -> float:
         """Return the escape velocity in m/s."""
         if self.radius_m > 0:
@@ -235,7 +291,7 @@ class PhysicalObject:
         """Return the velocity as a numpy array."""
         return self.velocity.to_numpy()
     
-    @property
+    @cached_property
     def kinetic_energy(self) -> float:
         """Return the kinetic energy in joules."""
         velocity_magnitude = self.velocity.magnitude()
@@ -245,8 +301,15 @@ class PhysicalObject:
         """Calculate the distance to another object in meters."""
         return (self.position - other.position).magnitude()
     
-    def gravitational_force_with(self, other: 'PhysicalObject') -> Vector3D:
-        """Calculate the gravitational force vector with another object in newtons."""
+    def gravitational_force_with(self, other: 'PhysicalObject', softening_m: float = 0.0) -> Vector3D:
+        """
+        Calculate the gravitational force vector with another object in newtons.
+        
+        Args:
+            other: The attracting object
+            softening_m: Plummer softening length; the force becomes
+                G m₁ m₂ r / (r² + ε²)^(3/2) and stays finite at close range
+        """
         r_vector = other.position - self.position
         distance = r_vector.magnitude()
         
@@ -254,7 +317,8 @@ class PhysicalObject:
             return Vector3D()
         
         # Calculate the gravitational force magnitude
-        force_magnitude = (self.GRAVITATIONAL_CONSTANT * self.mass_kg * other.mass_kg) / (distance ** 2)
+        softened_squared = distance ** 2 + softening_m ** 2
+        force_magnitude = (self.GRAVITATIONAL_CONSTANT * self.mass_kg * other.mass_kg) * distance / softened_squared ** 1.5
         
         # Calculate the force vector (direction from this object to the other)
         direction = r_vector.normalized()
@@ -279,20 +343,11 @@ class CelestialBody(PhysicalObject):
     rotation_period_s: float = 0.0  # Rotation period in seconds
     axial_tilt_rad: float = 0.0  # Axial tilt in radians
     
-    def __post_init__(self) -> None:
-        """Initialize celestial-body-specific properties."""
-        super().__post_init__()
-        
-        # Calculate orbital period if not provided but semi-major axis is
-        if ("period" not in self.orbital_parameters and 
-            "semi_major_axis" in self.orbital_parameters and 
-            "parent_mass" in self.properties):
-            parent_mass = self.properties["parent_mass"]
-            semi_major_axis = self.orbital_parameters["semi_major_axis"]
-            # Kepler's third law: T² = (4π²/G(M+m)) * a³
-            # For most cases M >> m, so we can approximate with just M
-            period_squared = (4 * (np.pi ** 2) / (self.GRAVITATIONAL_CONSTANT * parent_mass)) * (semi_major_axis ** 3)
-            self.orbital_parameters["period"] = np.sqrt(period_squared)
+    DERIVED_DEPENDENCIES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        **PhysicalObject.DERIVED_DEPENDENCIES,
+        "orbital_parameters": ("orbital_period", "orbital_speed"),
+        "properties": ("orbital_period", "orbital_speed"),
+    }
     
     @property
     def rotation_rate(self) -> float:
@@ -301,12 +356,27 @@ class CelestialBody(PhysicalObject):
             return 2 * np.pi / self.rotation_period_s
         return 0.0
     
-    @property
+    @cached_property
     def orbital_period(self) -> float:
-        """Return the orbital period in seconds."""
-        return self.orbital_parameters.get("period", 0.0)
+        """
+        Return the orbital period in seconds.
+        
+        Uses the tabulated period when available, otherwise derives it from
+        the semi-major axis and ``properties["parent_mass"]`` via Kepler's
+        third law.
+        """
+        if "period" in self.orbital_parameters:
+            return self.orbital_parameters["period"]
+        if "semi_major_axis" in self.orbital_parameters and "parent_mass" in self.properties:
+            parent_mass = self.properties["parent_mass"]
+            semi_major_axis = self.orbital_parameters["semi_major_axis"]
+            # Kepler's third law: T² = (4π²/G(M+m)) * a³
+            # For most cases M >> m, so we can approximate with just M
+            period_squared = (4 * (np.pi ** 2) / (self.GRAVITATIONAL_CONSTANT * parent_mass)) * (semi_major_axis ** 3)
+            return np.sqrt(period_squared)
+        return 0.0
     
-    @property
+    @cached_property
     def orbital_speed(self) -> float:
         """Return the average orbital speed in m/s."""
         if "semi_major_axis" in self.orbital_parameters and self.orbital_period > 0:
@@ -330,7 +400,7 @@ class CelestialBody(PhysicalObject):
         Ω = self.orbital_parameters.get("longitude_ascending_node", 0)
         ω = self.orbital_parameters.get("argument_periapsis", 0)
         M0 = self.orbital_parameters.get("mean_anomaly", 0)
-        period = self.orbital_parameters.get("period", 0)
+        period = self.orbital_period
         
         if a == 0 or period == 0:
             return self.position
@@ -346,10 +416,8 @@ class CelestialBody(PhysicalObject):
         n = 2 * np.pi / period  # Mean motion
         M = (M0 + n * dt) % (2 * np.pi)
         
-        # Solve Kepler's equation (simple approximation)
-        E = M
-        for _ in range(10):  # Iterative solution
-            E = M + e * np.sin(E)
+        # Solve Kepler's equation
+        E = float(solve_kepler_equation(M, e))
         
         # Calculate true anomaly
         ν = 2 * np.arctan2(np.sqrt(1 + e) * np.sin(E/2), np.sqrt(1 - e) * np.cos(E/2))
@@ -398,6 +466,16 @@ class Star(CelestialBody):
     luminosity_watts: float = 0.0
     spectral_type: str = ""
     
+    DERIVED_DEPENDENCIES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        **CelestialBody.DERIVED_DEPENDENCIES,
+        "luminosity_watts": ("habitable_zone",),
+    }
+    
+    DERIVED_PROPERTY_KEYS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        **CelestialBody.DERIVED_PROPERTY_KEYS,
+        "habitable_zone": ("habitable_zone_inner_au", "habitable_zone_outer_au"),
+    }
+    
     def __post_init__(self) -> None:
         """Initialize star-specific properties."""
         if not self.object_type == ObjectType.STAR:
@@ -408,21 +486,17 @@ class Star(CelestialBody):
         # Add star-specific properties
         self.properties["luminosity_watts"] = self.luminosity_watts
         self.properties["spectral_type"] = self.spectral_type
-        
-        # Calculate habitable zone (simplified)
-        if self.luminosity_watts > 0:
-            # Inner and outer edges of habitable zone in AU (simplified)
-            l_rel = self.luminosity_watts / 3.828e26  # Relative to Sun
-            self.properties["habitable_zone_inner_au"] = 0.75 * np.sqrt(l_rel)
-            self.properties["habitable_zone_outer_au"] = 1.8 * np.sqrt(l_rel)
     
-    @property
+    @cached_property
     def habitable_zone(self) -> Tuple[float, float]:
         """Return the inner and outer radius of the habitable zone in meters."""
-        inner_au = self.properties.get("habitable_zone_inner_au", 0)
-        outer_au = self.properties.get("habitable_zone_outer_au", 0)
+        if self.luminosity_watts <= 0:
+            return (0.0, 0.0)
+        
+        # Inner and outer edges of habitable zone in AU (simplified)
+        l_rel = self.luminosity_watts / 3.828e26  # Relative to Sun
         au_to_m = 1.496e11  # 1 AU in meters
-        return (inner_au * au_to_m, outer_au * au_to_m)
+        return (0.75 * np.sqrt(l_rel) * au_to_m, 1.8 * np.sqrt(l_rel) * au_to_m)
 
 
 @dataclass
@@ -481,6 +555,86 @@ class Comet(CelestialBody):
             self.properties["coma_radius_m"] = self.coma_radius_m
 
 
+class CometActivity:
+    """
+    Column-wise activity state (tail length and coma radius) for many comets.
+    
+    Applies the same model as :meth:`Comet.update_tail` to all comets in one
+    array expression. Activity can be refreshed every ``update_interval``
+    steps, and in between only for comets whose heliocentric distance moved by
+    more than ``distance_tolerance`` (a fraction of the last distance used).
+    """
+    
+    AU: ClassVar[float] = 1.496e11  # meters
+    
+    def __init__(self, comets: List[Comet], update_interval: int = 1, distance_tolerance: float = 0.0):
+        """
+        Initialize the activity arrays from the comets' current state.
+        
+        Args:
+            comets: Comets whose activity is tracked (order is preserved)
+            update_interval: Recompute all tails every this many updates
+            distance_tolerance: Relative distance change that triggers an early update
+        """
+        if update_interval < 1:
+            raise ValueError(f"Update interval must be at least 1: {update_interval}")
+        
+        self.comets = list(comets)
+        self.update_interval = update_interval
+        self.distance_tolerance = distance_tolerance
+        
+        self.base_tail_length_m = np.array(
+            [c.properties.get("base_tail_length_m", c.tail_length_m) for c in self.comets], dtype=float)
+        self.base_coma_radius_m = np.array(
+            [c.properties.get("base_coma_radius_m", c.coma_radius_m) for c in self.comets], dtype=float)
+        self.tail_length_m = np.array([c.tail_length_m for c in self.comets], dtype=float)
+        self.coma_radius_m = np.array([c.coma_radius_m for c in self.comets], dtype=float)
+        
+        # Distance at the last recomputation (NaN until the first one)
+        self.last_distance_m = np.full(len(self.comets), np.nan)
+        self._updates_since_full = 0
+    
+    def update(self, distances_to_star: np.ndarray) -> np.ndarray:
+        """
+        Update tails and comae from heliocentric distances.
+        
+        Args:
+            distances_to_star: Distance of each comet to the star in meters
+            
+        Returns:
+            Indices of the comets whose activity was recomputed
+        """
+        distances = np.asarray(distances_to_star, dtype=float)
+        
+        self._updates_since_full += 1
+        if self._updates_since_full >= self.update_interval:
+            self._updates_since_full = 0
+            due = np.ones(len(distances), dtype=bool)
+        else:
+            # Never-updated comets have a NaN last distance and compare as changed
+            change = np.abs(distances - self.last_distance_m)
+            due = ~(change <= self.distance_tolerance * self.last_distance_m)
+        
+        updated = np.flatnonzero(due & (distances > 0))
+        if updated.size == 0:
+            return updated
+        
+        d = distances[updated]
+        self.tail_length_m[updated] = self.base_tail_length_m[updated] * (5 * self.AU / d)
+        self.coma_radius_m[updated] = self.base_coma_radius_m[updated] * (2 * self.AU / d)
+        self.last_distance_m[updated] = d
+        
+        # Keep the comet objects in sync for the ones that changed
+        for k in updated:
+            comet = self.comets[k]
+            comet.tail_length_m = float(self.tail_length_m[k])
+            comet.coma_radius_m = float(self.coma_radius_m[k])
+            comet.properties["tail_length_m"] = comet.tail_length_m
+            comet.properties["coma_radius_m"] = comet.coma_radius_m
+        
+        return updated
+
+
 @dataclass
 class DustParticle(PhysicalObject):
     """Class for dust particles."""
@@ -529,6 +683,95 @@ class DustParticle(PhysicalObject):
             return np.sqrt((2 * self.mass_kg * gravity) / (fluid_density * cross_section * drag_coef))
 
 
+class DustPopulation:
+    """
+    Column-wise storage for a large population of dust particles.
+    
+    Diameters and material densities are held in flat float64 arrays, so
+    sampling and settling velocities are computed for the whole population
+    in array expressions instead of one :class:`DustParticle` at a time.
+    """
+    
+    def __init__(self, diameters_m: np.ndarray, densities_kg_m3: np.ndarray):
+        """
+        Initialize the population from per-particle columns.
+        
+        Args:
+            diameters_m: (N,) particle diameters in meters
+            densities_kg_m3: (N,) or scalar particle material densities in kg/m³
+        """
+        diameters = np.ascontiguousarray(diameters_m, dtype=float)
+        densities = np.ascontiguousarray(np.broadcast_to(densities_kg_m3, diameters.shape), dtype=float)
+        if diameters.ndim != 1:
+            raise ValueError(f"Diameters must be one-dimensional, got shape {diameters.shape}")
+        if np.any(diameters <= 0) or np.any(densities <= 0):
+            raise ValueError("Dust diameters and densities must be positive")
+        
+        self.diameter_m = diameters
+        self.density_kg_m3 = densities
+    
+    @classmethod
+    def sample_lognormal(cls,
+                         n_particles: int,
+                         median_diameter_microns: float,
+                         geometric_std: float,
+                         density_kg_m3: float,
+                         density_geometric_std: float = 1.0,
+                         seed: Optional[int] = None) -> 'DustPopulation':
+        """
+        Sample a population with log-normal sizes and densities.
+        
+        Args:
+            n_particles: Number of particles
+            median_diameter_microns: Count median diameter in microns
+            geometric_std: Geometric standard deviation of the diameters (>= 1)
+            density_kg_m3: Median material density in kg/m³
+            density_geometric_std: Geometric standard deviation of the densities
+                (1 gives every particle the same density)
+            seed: Seed for the random number generator
+        """
+        if geometric_std < 1 or density_geometric_std < 1:
+            raise ValueError("Geometric standard deviations must be at least 1")
+        
+        rng = np.random.default_rng(seed)
+        diameters = rng.lognormal(np.log(median_diameter_microns * 1e-6), np.log(geometric_std), n_particles)
+        if density_geometric_std > 1:
+            densities = rng.lognormal(np.log(density_kg_m3), np.log(density_geometric_std), n_particles)
+        else:
+            densities = np.full(n_particles, float(density_kg_m3))
+        return cls(diameters, densities)
+    
+    def __len__(self) -> int:
+        return len(self.diameter_m)
+    
+    @property
+    def radius_m(self) -> np.ndarray:
+        return self.diameter_m / 2
+    
+    @property
+    def mass_kg(self) -> np.ndarray:
+        return (np.pi / 6) * self.diameter_m ** 3 * self.density_kg_m3
+    
+    @property
+    def total_mass_kg(self) -> float:
+        return float(self.mass_kg.sum())
+    
+    def terminal_velocities(self, fluid_density: float, gravity: float, **kwargs: Any) -> np.ndarray:
+        """
+        Calculate the terminal settling velocity of every particle in m/s.
+        
+        Keyword arguments are passed on to :func:`dust_terminal_velocities`.
+        """
+        return dust_terminal_velocities(self.diameter_m, self.density_kg_m3, fluid_density, gravity, **kwargs)
+    
+    def to_particles(self, indices: Optional[np.ndarray] = None) -> List[DustParticle]:
+        """Create :class:`DustParticle` objects for the selected particles (default: all)."""
+        if indices is None:
+            indices = np.arange(len(self))
+        return [PhysicalObjectFactory.create_dust_particle(self.diameter_m[i] * 1e6, self.density_kg_m3[i])
+                for i in np.asarray(indices)]
+
+
 class PhysicalObjectFactory:
     """Factory class for creating common physical objects."""
     
@@ -689,6 +932,471 @@ class PhysicalObjectFactory:
             diameter_m=diameter_m,
             properties={"density_kg_m3": density_kg_m3}
         )
+    
+    @staticmethod
+    def create_dust_population(n_particles: int,
+                               median_diameter_microns: float,
+                               geometric_std: float,
+                               density_kg_m3: float,
+                               density_geometric_std: float = 1.0,
+                               seed: Optional[int] = None) -> DustPopulation:
+        """Create a log-normal dust population (see :meth:`DustPopulation.sample_lognormal`)."""
+        return DustPopulation.sample_lognormal(n_particles, median_diameter_microns, geometric_std,
+                                               density_kg_m3, density_geometric_std, seed)
+
+
+def _drag_force_number(reynolds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return Cd·Re² for a sphere and its logarithmic derivative d ln(Cd·Re²)/d ln Re.
+    
+    Cd(Re) = 24/Re (1 + 0.15 Re^0.687) + 0.42 / (1 + 42500 Re^-1.16)
+    (Clift and Gauvin), valid from the Stokes regime up to Re ≈ 3e5.
+    """
+    viscous = 24 * reynolds * (1 + 0.15 * reynolds ** 0.687)
+    denominator = 1 + 42500 * reynolds ** -1.16
+    inertial = 0.42 * reynolds ** 2 / denominator
+    
+    d_viscous = 24 * reynolds * (1 + 0.15 * 1.687 * reynolds ** 0.687)
+    d_inertial = inertial * (2 + 1.16 * 42500 * reynolds ** -1.16 / denominator)
+    value = viscous + inertial
+    return value, (d_viscous + d_inertial) / value
+
+
+def dust_terminal_velocities(diameters_m: np.ndarray,
+                             densities_kg_m3: Union[float, np.ndarray],
+                             fluid_density: float,
+                             gravity: float,
+                             viscosity: float = 1.8e-5,
+                             mean_free_path_m: float = 6.8e-8,
+                             stokes_reynolds_limit: float = 0.1,
+                             tolerance: float = 1e-10,
+                             max_iterations: int = 50) -> np.ndarray:
+    """
+    Compute terminal settling velocities for many spheres at once.
+    
+    Every particle starts from the slip-corrected Stokes velocity
+    
+        v = (ρₚ - ρf) g d² Cc / (18 μ),  Cc = 1 + Kn (1.257 + 0.4 e^(-1.1/Kn)),  Kn = 2λ/d
+    
+    Particles whose Stokes Reynolds number exceeds ``stokes_reynolds_limit``
+    are re-solved with the Reynolds-dependent drag coefficient: the force
+    balance fixes Cd·Re² = 4 (ρₚ - ρf) ρf g d³ Cc / (3 μ²), which is
+    monotonic in Re and is solved by Newton iteration in log space on the
+    still-unconverged particles only. Particles lighter than the fluid
+    get a zero velocity.
+    
+    Args:
+        diameters_m: (N,) particle diameters in meters
+        densities_kg_m3: (N,) or scalar particle densities in kg/m³
+        fluid_density: Density of the fluid (kg/m³)
+        gravity: Gravitational acceleration (m/s²)
+        viscosity: Dynamic viscosity of the fluid (Pa·s, air by default)
+        mean_free_path_m: Mean free path of the fluid molecules (air at sea level by default)
+        stokes_reynolds_limit: Largest Reynolds number treated with Stokes' law
+        tolerance: Convergence threshold on the relative Reynolds-number update
+        max_iterations: Maximum number of Newton iterations
+    
+    Returns:
+        (N,) terminal velocities in m/s
+    """
+    diameters = np.asarray(diameters_m, dtype=float)
+    buoyant_density = np.broadcast_to(np.asarray(densities_kg_m3, dtype=float) - fluid_density, diameters.shape)
+    sinking = buoyant_density > 0
+    
+    # Cunningham slip correction
+    knudsen = 2 * mean_free_path_m / diameters
+    slip = 1 + knudsen * (1.257 + 0.4 * np.exp(-1.1 / knudsen))
+    
+    velocities = np.where(sinking, buoyant_density * gravity * diameters ** 2 * slip / (18 * viscosity), 0.0)
+    reynolds_stokes = fluid_density * velocities * diameters / viscosity
+    
+    # Beyond the Stokes regime, solve Cd(Re)·Re² = X for Re
+    inertial = np.flatnonzero(reynolds_stokes > stokes_reynolds_limit)
+    if inertial.size:
+        log_target = np.log(reynolds_stokes[inertial] * 24)  # X = 24 Re_Stokes
+        # Start from the smaller of the Stokes and Newton-regime (Cd = 0.44) solutions
+        log_reynolds = np.minimum(np.log(reynolds_stokes[inertial]), 0.5 * (log_target - np.log(0.44)))
+        
+        active = np.arange(inertial.size)
+        for _ in range(max_iterations):
+            value, slope = _drag_force_number(np.exp(log_reynolds[active]))
+            step = (np.log(value) - log_target[active]) / slope
+            log_reynolds[active] -= step
+            active = active[np.abs(step) > tolerance]
+            if active.size == 0:
+                break
+        
+        d = diameters[inertial]
+        velocities[inertial] = np.exp(log_reynolds) * viscosity / (fluid_density * d)
+    
+    return velocities
+
+
+def gravitational_accelerations(target_positions: np.ndarray,
+                                source_positions: np.ndarray,
+                                source_masses: np.ndarray,
+                                reference_index: Optional[int] = None,
+                                softening_m: float = 0.0,
+                                excluded_sources: Optional[np.ndarray] = None,
+                                block_size: int = 1024) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Compute the gravitational acceleration of each target due to all sources.
+    
+    Coincident target/source pairs (including a body and itself) contribute
+    nothing, matching :meth:`PhysicalObject.gravitational_force_with`.
+    Targets are processed in blocks to bound the size of the pairwise arrays.
+    
+    Args:
+        target_positions: (T, 3) positions in meters
+        source_positions: (S, 3) positions in meters
+        source_masses: (S,) masses in kg
+        reference_index: Optional source index whose distance to every
+            target is returned alongside the accelerations
+        softening_m: Plummer softening length in meters
+        excluded_sources: Optional (T,) source index per target whose pull is
+            ignored (-1 for none), e.g. a regularized binary partner
+        block_size: Number of targets handled per block
+        
+    Returns:
+        (T, 3) accelerations in m/s² and, if requested, (T,) distances in meters
+    """
+    G = PhysicalObject.GRAVITATIONAL_CONSTANT
+    n_targets = len(target_positions)
+    accelerations = np.zeros((n_targets, 3))
+    reference_distances = np.empty(n_targets) if reference_index is not None else None
+    
+    for start in range(0, n_targets, block_size):
+        stop = min(start + block_size, n_targets)
+        r_vectors = source_positions[np.newaxis, :, :] - target_positions[start:stop, np.newaxis, :]
+        distances_squared = np.einsum("tsk,tsk->ts", r_vectors, r_vectors)
+        
+        # G m / (r² + ε²)^(3/2), zero where the bodies coincide
+        inv_r3 = np.zeros_like(distances_squared)
+        np.divide(G * source_masses[np.newaxis, :], (distances_squared + softening_m ** 2) ** 1.5,
+                  out=inv_r3, where=distances_squared > 0)
+        
+        if excluded_sources is not None:
+            block_excluded = excluded_sources[start:stop]
+            rows = np.flatnonzero(block_excluded >= 0)
+            inv_r3[rows, block_excluded[rows]] = 0.0
+        
+        accelerations[start:stop] = np.einsum("ts,tsk->tk", inv_r3, r_vectors)
+        
+        if reference_distances is not None:
+            reference_distances[start:stop] = np.sqrt(distances_squared[:, reference_index])
+    
+    return accelerations, reference_distances
+
+
+def dynamical_timescales(positions: np.ndarray,
+                         masses: np.ndarray,
+                         softening_m: float = 0.0,
+                         excluded_sources: Optional[np.ndarray] = None,
+                         block_size: int = 1024,
+                         source_indices: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Return each body's shortest two-body free-fall timescale in seconds.
+    
+    For body i this is min over j of sqrt((r² + ε²)^(3/2) / G(mᵢ + mⱼ)),
+    the natural step-size scale for its closest gravitational interaction.
+    Bodies without any partner get an infinite timescale.
+    
+    Args:
+        positions: (N, 3) positions in meters
+        masses: (N,) masses in kg
+        softening_m: Plummer softening length in meters
+        excluded_sources: Optional (N,) partner per body to ignore, as a
+            position in the source list (-1 for none)
+        block_size: Number of bodies handled per block
+        source_indices: Optional indices of the bodies that count as partners
+            (default: all), e.g. only the massive ones
+    """
+    G = PhysicalObject.GRAVITATIONAL_CONSTANT
+    n = len(positions)
+    timescales = np.full(n, np.inf)
+    if source_indices is None:
+        source_positions, source_masses = positions, masses
+    else:
+        source_positions, source_masses = positions[source_indices], masses[source_indices]
+    
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        r_vectors = source_positions[np.newaxis, :, :] - positions[start:stop, np.newaxis, :]
+        distances_squared = np.einsum("tsk,tsk->ts", r_vectors, r_vectors)
+        
+        t_squared = np.full_like(distances_squared, np.inf)
+        np.divide((distances_squared + softening_m ** 2) ** 1.5,
+                  G * (masses[start:stop, np.newaxis] + source_masses[np.newaxis, :]),
+                  out=t_squared, where=distances_squared > 0)
+        
+        if excluded_sources is not None:
+            block_excluded = excluded_sources[start:stop]
+            rows = np.flatnonzero(block_excluded >= 0)
+            t_squared[rows, block_excluded[rows]] = np.inf
+        
+        if t_squared.shape[1]:
+            timescales[start:stop] = np.sqrt(t_squared.min(axis=1))
+    
+    return timescales
+
+
+def solve_kepler_equation(mean_anomaly: Union[float, np.ndarray],
+                          eccentricity: Union[float, np.ndarray],
+                          tolerance: float = 1e-14,
+                          max_iterations: int = 50) -> np.ndarray:
+    """
+    Solve Kepler's equation M = E - e sin E for the eccentric anomaly E.
+    
+    Vectorized Newton iteration for elliptic orbits (0 ≤ e < 1). The mean
+    anomaly is reduced to [-π, π) and the whole revolutions are added back,
+    and the starting guess E₀ = M + 0.85 e sign(sin M) converges for every
+    eccentricity, including the near-parabolic comets where plain fixed-point
+    iteration does not.
+    
+    Args:
+        mean_anomaly: Mean anomaly in radians (any range)
+        eccentricity: Orbital eccentricity
+        tolerance: Absolute convergence tolerance in radians
+        max_iterations: Iteration cap
+        
+    Returns:
+        Eccentric anomaly in radians, on the same revolution as the input
+    """
+    M = np.asarray(mean_anomaly, dtype=float)
+    e = np.asarray(eccentricity, dtype=float)
+    if np.any((e < 0) | (e >= 1)):
+        raise ValueError("Kepler's equation solver needs 0 <= e < 1")
+    
+    revolutions = np.floor((M + np.pi) / (2 * np.pi))
+    M_reduced = M - 2 * np.pi * revolutions
+    
+    E = M_reduced + 0.85 * e * np.sign(np.sin(M_reduced))
+    for _ in range(max_iterations):
+        delta = (E - e * np.sin(E) - M_reduced) / (1 - e * np.cos(E))
+        E = E - delta
+        if np.all(np.abs(delta) <= tolerance):
+            break
+    
+    return E + 2 * np.pi * revolutions
+
+
+def kepler_drift(positions: np.ndarray,
+                 velocities: np.ndarray,
+                 mu: float,
+                 time_step: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Advance bodies along unperturbed Kepler orbits about a fixed center.
+    
+    Bound orbits use Gauss's f and g functions with the eccentric-anomaly
+    change taken from :func:`solve_kepler_equation`; unbound and parabolic
+    orbits go through :func:`propagate_two_body_ks`.
+    
+    Args:
+        positions: (n, 3) positions relative to the center in meters
+        velocities: (n, 3) velocities in m/s
+        mu: Gravitational parameter of the center in m³/s²
+        time_step: Time to advance in seconds
+        
+    Returns:
+        (n, 3) positions and (n, 3) velocities after the drift
+    """
+    positions = np.asarray(positions, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+    new_positions = positions.copy()
+    new_velocities = velocities.copy()
+    
+    r0 = np.sqrt(np.einsum("ij,ij->i", positions, positions))
+    v_squared = np.einsum("ij,ij->i", velocities, velocities)
+    sigma0 = np.einsum("ij,ij->i", positions, velocities)
+    inverse_a = np.zeros_like(r0)
+    np.divide(2.0, r0, out=inverse_a, where=r0 > 0)
+    inverse_a -= v_squared / mu
+    
+    bound = (inverse_a > 0) & (r0 > 0)
+    if bound.any():
+        r0_b = r0[bound]
+        a = 1 / inverse_a[bound]
+        n = np.sqrt(mu / a ** 3)
+        
+        # e cos E₀ and e sin E₀ from the current state
+        e_cos = 1 - r0_b / a
+        e_sin = sigma0[bound] / np.sqrt(mu * a)
+        E0 = np.arctan2(e_sin, e_cos)
+        M1 = E0 - e_sin + n * time_step
+        dE = solve_kepler_equation(M1, np.hypot(e_cos, e_sin)) - E0
+        
+        sin_dE = np.sin(dE)
+        one_minus_cos = 1 - np.cos(dE)
+        r = a * (1 - e_cos * np.cos(dE) + e_sin * sin_dE)
+        f = 1 - (a / r0_b) * one_minus_cos
+        g = time_step - (dE - sin_dE) / n
+        f_dot = -np.sqrt(mu * a) * sin_dE / (r * r0_b)
+        g_dot = 1 - (a / r) * one_minus_cos
+        
+        p0, v0 = positions[bound], velocities[bound]
+        new_positions[bound] = f[:, np.newaxis] * p0 + g[:, np.newaxis] * v0
+        new_velocities[bound] = f_dot[:, np.newaxis] * p0 + g_dot[:, np.newaxis] * v0
+    
+    unbound = ~bound & (r0 > 0)
+    if unbound.any():
+        new_positions[unbound], new_velocities[unbound] = propagate_two_body_ks(
+            positions[unbound], velocities[unbound], np.full(unbound.sum(), mu), time_step
+        )
+    
+    return new_positions, new_velocities
+
+
+def _stumpff_functions(z: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return the Stumpff functions c0..c3 of z, using series near z = 0."""
+    z = np.asarray(z, dtype=float)
+    c0 = np.empty_like(z)
+    c1 = np.empty_like(z)
+    c2 = np.empty_like(z)
+    c3 = np.empty_like(z)
+    
+    small = np.abs(z) < 0.1
+    pos = (z > 0) & ~small
+    neg = (z < 0) & ~small
+    
+    zs = z[small]
+    c0[small] = 1 - zs / 2 * (1 - zs / 12 * (1 - zs / 30 * (1 - zs / 56 * (1 - zs / 90))))
+    c1[small] = 1 - zs / 6 * (1 - zs / 20 * (1 - zs / 42 * (1 - zs / 72 * (1 - zs / 110))))
+    c2[small] = (1 - zs / 12 * (1 - zs / 30 * (1 - zs / 56 * (1 - zs / 90 * (1 - zs / 132))))) / 2
+    c3[small] = (1 - zs / 20 * (1 - zs / 42 * (1 - zs / 72 * (1 - zs / 110 * (1 - zs / 156))))) / 6
+    
+    root = np.sqrt(z[pos])
+    c0[pos] = np.cos(root)
+    c1[pos] = np.sin(root) / root
+    root = np.sqrt(-z[neg])
+    c0[neg] = np.cosh(root)
+    c1[neg] = np.sinh(root) / root
+    
+    large = ~small
+    c2[large] = (1 - c0[large]) / z[large]
+    c3[large] = (1 - c1[large]) / z[large]
+    return c0, c1, c2, c3
+
+
+def propagate_two_body_ks(relative_positions: np.ndarray,
+                          relative_velocities: np.ndarray,
+                          mu: np.ndarray,
+                          time_step: float,
+                          tolerance: float = 1e-14,
+                          max_iterations: int = 60) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Advance isolated two-body relative orbits with Kustaanheimo–Stiefel regularization.
+    
+    The relative position is mapped to a 4D KS spinor u with r = |u|², in
+    which the Kepler problem becomes a harmonic oscillator in the fictitious
+    time τ (dt = r dτ). The oscillator is advanced analytically, so the
+    result is exact and stays regular through arbitrarily close approaches,
+    for bound and unbound orbits alike. The τ matching the physical time step
+    is found from the universal Kepler equation with a safeguarded Newton
+    iteration.
+    
+    Args:
+        relative_positions: (n, 3) separations in meters
+        relative_velocities: (n, 3) relative velocities in m/s
+        mu: (n,) gravitational parameters G(m₁ + m₂) in m³/s²
+        time_step: Physical time to advance in seconds
+        tolerance: Relative convergence tolerance on τ
+        max_iterations: Iteration cap for the time equation
+        
+    Returns:
+        (n, 3) relative positions and (n, 3) relative velocities after the step
+    """
+    r_vec = np.asarray(relative_positions, dtype=float)
+    v_vec = np.asarray(relative_velocities, dtype=float)
+    mu = np.broadcast_to(np.asarray(mu, dtype=float), (len(r_vec),))
+    x, y, z = r_vec[:, 0], r_vec[:, 1], r_vec[:, 2]
+    r0 = np.sqrt(x * x + y * y + z * z)
+    if np.any(r0 == 0):
+        raise ValueError("KS regularization needs a non-zero separation")
+    
+    # KS spinor u with L(u) u = r, picking the branch that avoids cancellation
+    u = np.zeros((len(r_vec), 4))
+    upper = x >= 0
+    a = np.sqrt((r0[upper] + x[upper]) / 2)
+    u[upper, 0] = a
+    u[upper, 1] = y[upper] / (2 * a)
+    u[upper, 2] = z[upper] / (2 * a)
+    lower = ~upper
+    b = np.sqrt((r0[lower] - x[lower]) / 2)
+    u[lower, 1] = b
+    u[lower, 0] = y[lower] / (2 * b)
+    u[lower, 3] = z[lower] / (2 * b)
+    
+    # u' = ½ Lᵀ(u) v
+    vx, vy, vz = v_vec[:, 0], v_vec[:, 1], v_vec[:, 2]
+    u1, u2, u3, u4 = u.T
+    w = 0.5 * np.stack([
+        u1 * vx + u2 * vy + u3 * vz,
+        -u2 * vx + u1 * vy + u4 * vz,
+        -u3 * vx - u4 * vy + u1 * vz,
+        u4 * vx - u3 * vy + u2 * vz,
+    ], axis=1)
+    
+    # β = -2h, where h is the specific orbital energy
+    sigma0 = np.einsum("ij,ij->i", r_vec, v_vec)
+    beta = 2 * mu / r0 - np.einsum("ij,ij->i", v_vec, v_vec)
+    
+    def elapsed(tau):
+        c0, c1, c2, c3 = _stumpff_functions(beta * tau ** 2)
+        t = r0 * tau * c1 + sigma0 * tau ** 2 * c2 + mu * tau ** 3 * c3
+        r = r0 * c0 + sigma0 * tau * c1 + mu * tau ** 2 * c2
+        return t, r
+    
+    # Bracket the root of t(τ) = Δt (t is monotonic since dt/dτ = r > 0),
+    # starting from Δt/r₀ but below where cosh would overflow on unbound orbits
+    hi = np.full(len(r0), time_step) / r0
+    unbound = beta < 0
+    hi[unbound] = np.minimum(hi[unbound], np.sqrt(50 / -beta[unbound]))
+    lo = np.zeros_like(hi)
+    t_hi, _ = elapsed(hi)
+    for _ in range(max_iterations):
+        short = t_hi < time_step
+        if not short.any():
+            break
+        lo[short] = hi[short]
+        hi[short] *= 2
+        t_hi, _ = elapsed(hi)
+    tau = hi.copy()
+    
+    # Newton on t(τ) - Δt, falling back to bisection whenever it leaves the bracket
+    for _ in range(max_iterations):
+        t, r = elapsed(tau)
+        residual = t - time_step
+        lo = np.where(residual < 0, tau, lo)
+        hi = np.where(residual > 0, tau, hi)
+        step = residual / r
+        candidate = tau - step
+        outside = (candidate <= lo) | (candidate >= hi)
+        candidate[outside] = 0.5 * (lo[outside] + hi[outside])
+        converged = np.abs(candidate - tau) <= tolerance * np.abs(candidate)
+        tau = candidate
+        if converged.all():
+            break
+    
+    # Harmonic oscillator in τ: u'' = -(β/4) u
+    c0, c1, _, _ = _stumpff_functions(beta * tau ** 2 / 4)
+    alpha = beta / 4
+    u_new = u * c0[:, np.newaxis] + w * (tau * c1)[:, np.newaxis]
+    w_new = -u * (alpha * tau * c1)[:, np.newaxis] + w * c0[:, np.newaxis]
+    
+    u1, u2, u3, u4 = u_new.T
+    w1, w2, w3, w4 = w_new.T
+    r = np.einsum("ij,ij->i", u_new, u_new)
+    positions = np.stack([
+        u1 * u1 - u2 * u2 - u3 * u3 + u4 * u4,
+        2 * (u1 * u2 - u3 * u4),
+        2 * (u1 * u3 + u2 * u4),
+    ], axis=1)
+    velocities = 2 * np.stack([
+        u1 * w1 - u2 * w2 - u3 * w3 + u4 * w4,
+        u2 * w1 + u1 * w2 - u4 * w3 - u3 * w4,
+        u3 * w1 + u4 * w2 + u1 * w3 + u2 * w4,
+    ], axis=1) / r[:, np.newaxis]
+    return positions, velocities
 
 
 class PhysicalSystem:
@@ -708,6 +1416,22 @@ class PhysicalSystem:
         self.central_object = central_object
         self.objects: List[PhysicalObject] = []
         
+        # Comet activity refresh policy (see CometActivity)
+        self.comet_update_interval = 1
+        self.comet_distance_tolerance = 0.0
+        self._comet_activity: Optional[CometActivity] = None
+        self._comet_indices: Optional[np.ndarray] = None
+        self._comet_object_count = 0
+        
+        # Integration scheme: "euler" or "wisdom_holman"
+        self.integrator = "euler"
+        
+        # Close-encounter handling (all disabled by default)
+        self.softening_length_m = 0.0       # Plummer softening of every pairwise force
+        self.regularization_radius_m = 0.0  # pairs closer than this move on KS-regularized orbits
+        self.max_timestep_level = 0         # bodies may take up to 2**level substeps per step
+        self.timestep_accuracy = 0.01       # substep as a fraction of the body's free-fall time
+        
         if central_object:
             self.objects.append(central_object)
     
@@ -715,11 +1439,13 @@ class PhysicalSystem:
         """Add an object to the system."""
         if obj not in self.objects:
             self.objects.append(obj)
+            self._comet_activity = None
     
     def remove_object(self, obj: PhysicalObject) -> None:
         """Remove an object from the system."""
         if obj in self.objects:
             self.objects.remove(obj)
+            self._comet_activity = None
     
     def get_object_by_name(self, name: str) -> Optional[PhysicalObject]:
         """Find an object by name."""
@@ -731,6 +1457,200 @@ class PhysicalSystem:
     def get_objects_by_type(self, object_type: ObjectType) -> List[PhysicalObject]:
         """Get all objects of a specific type."""
         return [obj for obj in self.objects if obj.object_type == object_type]
+
+    # Column-wise accessors: gather the primary attributes once and evaluate
+    # derived quantities for the whole population as array expressions
+
+    def get_masses(self) -> np.ndarray:
+        """Return the masses of all objects in kg."""
+        return np.fromiter((obj.mass_kg for obj in self.objects), dtype=float, count=len(self.objects))
+
+    def get_test_particle_mask(self) -> np.ndarray:
+        """Return a boolean array marking the objects flagged as test particles."""
+        return np.fromiter((obj.test_particle for obj in self.objects), dtype=bool, count=len(self.objects))
+
+    def get_radii(self) -> np.ndarray:
+        """Return the radii of all objects in meters."""
+        return np.fromiter((obj.radius_m for obj in self.objects), dtype=float, count=len(self.objects))
+
+    def get_positions(self) -> np.ndarray:
+        """Return the positions of all objects as an (N, 3) array in meters."""
+        positions = np.empty((len(self.objects), 3))
+        for i, obj in enumerate(self.objects):
+            positions[i] = (obj.position.x, obj.position.y, obj.position.z)
+        return positions
+
+    def get_velocities(self) -> np.ndarray:
+        """Return the velocities of all objects as an (N, 3) array in m/s."""
+        velocities = np.empty((len(self.objects), 3))
+        for i, obj in enumerate(self.objects):
+            velocities[i] = (obj.velocity.x, obj.velocity.y, obj.velocity.z)
+        return velocities
+
+    def get_volumes(self) -> np.ndarray:
+        """Return the volumes of all objects in m³ (0 where the radius is unknown)."""
+        radii = self.get_radii()
+        return (4/3) * np.pi * radii ** 3
+
+    def get_densities(self) -> np.ndarray:
+        """Return the densities of all objects in kg/m³ (0 where the radius is unknown)."""
+        volumes = self.get_volumes()
+        densities = np.zeros_like(volumes)
+        np.divide(self.get_masses(), volumes, out=densities, where=volumes > 0)
+        return densities
+
+    def get_surface_gravities(self) -> np.ndarray:
+        """Return the surface gravities of all objects in m/s²."""
+        radii = self.get_radii()
+        gravities = np.zeros_like(radii)
+        np.divide(PhysicalObject.GRAVITATIONAL_CONSTANT * self.get_masses(), radii ** 2,
+                  out=gravities, where=radii > 0)
+        return gravities
+
+    def get_escape_velocities(self) -> np.ndarray:
+        """Return the escape velocities of all objects in m/s."""
+        radii = self.get_radii()
+        ratio = np.zeros_like(radii)
+        np.divide(2 * PhysicalObject.GRAVITATIONAL_CONSTANT * self.get_masses(), radii,
+                  out=ratio, where=radii > 0)
+        return np.sqrt(ratio)
+
+    def get_kinetic_energies(self) -> np.ndarray:
+        """Return the kinetic energies of all objects in joules."""
+        velocities = self.get_velocities()
+        return 0.5 * self.get_masses() * np.einsum("ij,ij->i", velocities, velocities)
+
+    def get_orbital_periods(self) -> np.ndarray:
+        """Return the orbital periods of all objects in seconds (0 if not orbiting)."""
+        n = len(self.objects)
+        periods = np.zeros(n)
+        semi_major_axes = np.zeros(n)
+        parent_masses = np.zeros(n)
+        for i, obj in enumerate(self.objects):
+            if isinstance(obj, CelestialBody):
+                periods[i] = obj.orbital_parameters.get("period", 0.0)
+                semi_major_axes[i] = obj.orbital_parameters.get("semi_major_axis", 0.0)
+                parent_masses[i] = obj.properties.get("parent_mass", 0.0)
+
+        # Kepler's third law wherever the period has to be derived
+        derive = (periods == 0) & (semi_major_axes > 0) & (parent_masses > 0)
+        periods[derive] = 2 * np.pi * np.sqrt(
+            semi_major_axes[derive] ** 3 / (PhysicalObject.GRAVITATIONAL_CONSTANT * parent_masses[derive])
+        )
+        return periods
+
+    def get_orbital_speeds(self) -> np.ndarray:
+        """Return the average (circular-orbit) orbital speeds of all objects in m/s."""
+        semi_major_axes = np.fromiter(
+            (obj.orbital_parameters.get("semi_major_axis", 0.0) if isinstance(obj, CelestialBody) else 0.0
+             for obj in self.objects),
+            dtype=float, count=len(self.objects)
+        )
+        periods = self.get_orbital_periods()
+        speeds = np.zeros_like(periods)
+        np.divide(2 * np.pi * semi_major_axes, periods, out=speeds, where=periods > 0)
+        return speeds
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Return the state of the system as a table of contiguous columns.
+        
+        Columns are ``name``, ``object_type``, ``mass_kg``, ``radius_m``,
+        ``test_particle``, ``position_x/y/z`` and ``velocity_x/y/z``, plus one
+        ``properties.<key>`` column per key found in any object's
+        ``properties``. Numeric and boolean properties become float64 columns
+        with NaN where an object lacks the key; anything else is stored as
+        strings (empty where missing).
+        
+        The derived ``properties.volume_m3`` and ``properties.density_kg_m3``
+        (objects with a radius) and ``properties.habitable_zone_inner_au`` /
+        ``_outer_au`` (luminous stars) are computed here for the whole
+        population rather than stored on the objects.
+        """
+        n = len(self.objects)
+        positions = self.get_positions()
+        velocities = self.get_velocities()
+        columns: Dict[str, np.ndarray] = {
+            "name": np.array([obj.name for obj in self.objects], dtype=str),
+            "object_type": np.array([obj.object_type.name for obj in self.objects], dtype=str),
+            "mass_kg": self.get_masses(),
+            "radius_m": self.get_radii(),
+            "test_particle": self.get_test_particle_mask(),
+        }
+        for axis, k in (("x", 0), ("y", 1), ("z", 2)):
+            columns[f"position_{axis}"] = np.ascontiguousarray(positions[:, k])
+        for axis, k in (("x", 0), ("y", 1), ("z", 2)):
+            columns[f"velocity_{axis}"] = np.ascontiguousarray(velocities[:, k])
+        
+        # Flatten properties: collect values per key, then pick a column type
+        values_by_key: Dict[str, Dict[int, Any]] = {}
+        for i, obj in enumerate(self.objects):
+            for key, value in obj.properties.items():
+                values_by_key.setdefault(key, {})[i] = value
+        
+        for key, values in values_by_key.items():
+            if all(isinstance(v, (bool, int, float, np.number, np.bool_)) for v in values.values()):
+                column = np.full(n, np.nan)
+                for i, value in values.items():
+                    column[i] = float(value)
+            else:
+                column = np.array([str(values[i]) if i in values else "" for i in range(n)], dtype=str)
+            columns[f"properties.{key}"] = column
+        
+        # Derived properties, NaN where they do not apply
+        radii = self.get_radii()
+        has_radius = radii > 0
+        columns["properties.volume_m3"] = np.where(has_radius, self.get_volumes(), np.nan)
+        columns["properties.density_kg_m3"] = np.where(has_radius, self.get_densities(), np.nan)
+        
+        au_to_m = 1.496e11  # 1 AU in meters
+        stars = [(i, obj) for i, obj in enumerate(self.objects)
+                 if isinstance(obj, Star) and obj.luminosity_watts > 0]
+        if stars:
+            for edge, name in ((0, "inner"), (1, "outer")):
+                column = np.full(n, np.nan)
+                for i, star in stars:
+                    column[i] = star.habitable_zone[edge] / au_to_m
+                columns[f"properties.habitable_zone_{name}_au"] = column
+        
+        return columns
+    
+    def save_snapshot(self, path: str) -> str:
+        """
+        Write the columnar state of the system to disk.
+        
+        The format follows the file extension: ``.parquet`` for Parquet,
+        ``.arrow``/``.feather`` for Arrow IPC and ``.npz`` for NumPy archives.
+        Parquet and Arrow need pyarrow; without it the snapshot is written as
+        ``.npz`` next to the requested path instead.
+        
+        Args:
+            path: Destination file path
+            
+        Returns:
+            The path that was actually written
+        """
+        columns = self.to_columns()
+        root, ext = os.path.splitext(path)
+        ext = ext.lower()
+        
+        if ext in (".parquet", ".arrow", ".feather") and pa is None:
+            path, ext = root + ".npz", ".npz"
+        elif ext not in (".parquet", ".arrow", ".feather", ".npz"):
+            raise ValueError(f"Unsupported snapshot format: {ext or path}")
+        
+        if ext == ".npz":
+            np.savez(path, **columns)
+            return path
+        
+        table = pa.table(columns)
+        if ext == ".parquet":
+            pq.write_table(table, path)
+        else:
+            with pa.OSFile(path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        return path
     
     def calculate_center_of_mass(self) -> Vector3D:
         """Calculate the center of mass of the system."""
@@ -769,33 +1689,345 @@ class PhysicalSystem:
         """
         Simulate one time step (in seconds) of the system's evolution.
         
-        Uses a simple Euler integration method. For more accurate simulations,
-        consider using Runge-Kutta or symplectic integrators.
+        The method is chosen by ``integrator``:
+        
+        - ``"euler"`` (default): a simple Euler integration method (kick, then
+          drift). For more accurate simulations, consider the symplectic mode.
+        - ``"wisdom_holman"``: mixed-variable symplectic map around
+          ``central_object`` (see :meth:`_wisdom_holman_step`). For planetary
+          systems it allows far larger steps at the same accuracy. The
+          central object must be massive (not a test particle), and the
+          Euler-only close-encounter options below must be left disabled.
+        
+        In Euler mode close encounters are handled per body rather than by
+        shrinking ``time_step`` for everyone:
+        
+        - ``softening_length_m`` applies Plummer softening to all forces.
+        - Pairs closer than ``regularization_radius_m`` have their mutual
+          attraction removed from the force pass; their relative orbit is
+          advanced exactly with :func:`propagate_two_body_ks` while external
+          forces still kick both members.
+        - With ``max_timestep_level`` > 0, each body gets a block step of
+          ``time_step / 2**level``, where the level is chosen so the step is at
+          most ``timestep_accuracy`` times its shortest free-fall time. Bodies
+          on coarse levels are only kicked at the start of their own step.
+        
+        Objects with ``test_particle`` set (dust, small debris) are moved by
+        the massive bodies' field but exert no force themselves, in either
+        mode. Forces are then evaluated only from the massive bodies, so a
+        step costs O(N × N_massive) instead of O(N²).
         """
-        # Calculate accelerations for each object
-        accelerations = [Vector3D() for _ in self.objects]
+        positions = self.get_positions()
+        velocities = self.get_velocities()
         
-        # Calculate gravitational forces between all pairs of objects
-        for i, obj1 in enumerate(self.objects):
-            for j, obj2 in enumerate(self.objects):
-                if i != j:
-                    force = obj1.gravitational_force_with(obj2)
-                    accelerations[i] = accelerations[i] + (force / obj1.mass_kg)
+        # Test particles integrate as if massless
+        masses = np.where(self.get_test_particle_mask(), 0.0, self.get_masses())
+        
+        if self.integrator == "wisdom_holman":
+            star_distances = self._wisdom_holman_step(positions, velocities, masses, time_step)
+        elif self.integrator == "euler":
+            star_distances = self._block_euler_step(positions, velocities, masses, time_step)
+        else:
+            raise ValueError(f"Unknown integrator: {self.integrator}")
         
-        # Update velocities based on accelerations
         for i, obj in enumerate(self.objects):
-            obj.update_velocity(accelerations[i], time_step)
+            obj.velocity = Vector3D.from_numpy(velocities[i])
+            obj.position = Vector3D.from_numpy(positions[i])
         
-        # Update positions based on velocities
-        for obj in self.objects:
-            obj.update_position(time_step)
-            
         # Update comet tails if applicable
-        if self.central_object and self.central_object.object_type == ObjectType.STAR:
-            for obj in self.objects:
-                if obj.object_type == ObjectType.COMET and isinstance(obj, Comet):
-                    distance = obj.distance_to(self.central_object)
-                    obj.update_tail(self.central_object.position_vector, distance)
+        if star_distances is not None:
+            activity = self._get_comet_activity()
+            if activity.comets:
+                activity.update(star_distances[self._comet_indices])
+    
+    def _block_euler_step(self, positions: np.ndarray, velocities: np.ndarray,
+                          masses: np.ndarray, time_step: float) -> Optional[np.ndarray]:
+        """
+        Advance the state arrays in place with the (block-step) Euler scheme.
+        
+        Returns:
+            Distances to the central star at the start of the step, if there is one
+        """
+        n = len(positions)
+        
+        # Only massive bodies source forces; excluded partners are given as source positions
+        sources = np.flatnonzero(masses > 0)
+        source_slots = np.full(n, -1, dtype=int)
+        source_slots[sources] = np.arange(len(sources))
+        
+        pairs = self._find_regularized_pairs(positions, masses)
+        partners = np.full(n, -1, dtype=int)
+        partners[pairs[:, 0]] = pairs[:, 1]
+        partners[pairs[:, 1]] = pairs[:, 0]
+        excluded = np.where(partners >= 0, source_slots[partners], -1) if len(pairs) else None
+        
+        levels = np.zeros(n, dtype=int)
+        if self.max_timestep_level > 0 and n > 1:
+            timescales = dynamical_timescales(positions, masses, self.softening_length_m, excluded,
+                                              source_indices=sources)
+            with np.errstate(divide="ignore"):
+                wanted = np.ceil(np.log2(time_step / (self.timestep_accuracy * timescales)))
+            levels = np.clip(wanted, 0, self.max_timestep_level).astype(int)
+        
+        top_level = int(levels.max()) if n else 0
+        substeps = 2 ** top_level
+        stride = 2 ** (top_level - levels)
+        body_steps = time_step / 2.0 ** levels
+        
+        # Distances to the star at the start of the step, for the comet update,
+        # come out of the first force pass (every body is active in it) while
+        # the star is a force source; a test-particle star needs its own pass
+        star_index = self._star_index()
+        star_distances = None
+        star_slot = source_slots[star_index] if star_index is not None else -1
+        if star_index is not None and star_slot < 0:
+            offsets = positions - positions[star_index]
+            star_distances = np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+        
+        source_positions = np.empty((len(sources), 3))
+        for substep in range(substeps):
+            active = np.flatnonzero(substep % stride == 0)
+            np.take(positions, sources, axis=0, out=source_positions)
+            accelerations, distances = gravitational_accelerations(
+                positions[active], source_positions, masses[sources],
+                reference_index=star_slot if substep == 0 and star_slot >= 0 else None,
+                softening_m=self.softening_length_m,
+                excluded_sources=excluded[active] if excluded is not None else None,
+            )
+            if distances is not None:
+                star_distances = distances
+            
+            # Kick the active bodies over their own step, then drift everyone
+            velocities[active] += accelerations * body_steps[active, np.newaxis]
+            self._drift(positions, velocities, masses, pairs, time_step / substeps)
+        
+        return star_distances
+    
+    def _wisdom_holman_step(self, positions: np.ndarray, velocities: np.ndarray,
+                            masses: np.ndarray, time_step: float) -> Optional[np.ndarray]:
+        """
+        Advance the state arrays in place with a Wisdom–Holman map.
+        
+        Uses democratic heliocentric coordinates (heliocentric positions,
+        barycentric velocities). The Hamiltonian splits into Kepler motion
+        about the central mass, solved analytically by :func:`kepler_drift`,
+        the mutual attraction of the other bodies (a kick) and the central
+        body's reflex motion (a linear drift). These are composed as
+        kick/2 · jump/2 · Kepler · jump/2 · kick/2, which is second order and
+        symplectic. ``softening_length_m`` applies to the mutual kicks. Test
+        particles enter with zero mass, so they do not move the center or
+        each other and only the massive bodies are force sources in the kick.
+        
+        Returns:
+            Heliocentric distances at the start of the step if the center is a star
+        """
+        center = self._central_index()
+        if center is None:
+            raise ValueError("The Wisdom-Holman integrator needs the central object in the system")
+        if self.regularization_radius_m > 0 or self.max_timestep_level > 0:
+            raise ValueError("regularization_radius_m and max_timestep_level are only supported "
+                             "by the Euler integrator")
+        
+        G = PhysicalObject.GRAVITATIONAL_CONSTANT
+        others = np.flatnonzero(np.arange(len(positions)) != center)
+        central_mass = masses[center]
+        if central_mass <= 0:
+            raise ValueError(f"The Wisdom-Holman integrator needs a massive central object, "
+                             f"but {self.central_object.name} is a test particle")
+        total_mass = masses.sum()
+        other_masses = masses[others]
+        massive_others = np.flatnonzero(other_masses > 0)
+        
+        com_position = masses @ positions / total_mass
+        com_velocity = masses @ velocities / total_mass
+        heliocentric = positions[others] - positions[center]
+        barycentric_velocities = velocities[others] - com_velocity
+        
+        star_distances = None
+        if self.central_object.object_type == ObjectType.STAR:
+            star_distances = np.zeros(len(positions))
+            star_distances[others] = np.sqrt(np.einsum("ij,ij->i", heliocentric, heliocentric))
+        
+        def kick(dt: float) -> None:
+            accelerations, _ = gravitational_accelerations(
+                heliocentric, heliocentric[massive_others], other_masses[massive_others],
+                softening_m=self.softening_length_m
+            )
+            barycentric_velocities[:] += accelerations * dt
+        
+        def jump(dt: float) -> None:
+            heliocentric[:] += (other_masses @ barycentric_velocities) / central_mass * dt
+        
+        half = time_step / 2
+        kick(half)
+        jump(half)
+        heliocentric[:], barycentric_velocities[:] = kepler_drift(
+            heliocentric, barycentric_velocities, G * central_mass, time_step
+        )
+        jump(half)
+        kick(half)
+        
+        # Back to barycentric-frame positions and velocities
+        com_position += com_velocity * time_step
+        central_position = com_position - other_masses @ heliocentric / total_mass
+        positions[center] = central_position
+        positions[others] = heliocentric + central_position
+        velocities[center] = com_velocity - other_masses @ barycentric_velocities / central_mass
+        velocities[others] = barycentric_velocities + com_velocity
+        
+        return star_distances
+    
+    def _central_index(self) -> Optional[int]:
+        """Return the index of the central object in ``objects``, if present."""
+        if self.central_object is None:
+            return None
+        for i, obj in enumerate(self.objects):
+            if obj is self.central_object:
+                return i
+        return None
+    
+    def _find_regularized_pairs(self, positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+        """
+        Pick disjoint pairs closer than ``regularization_radius_m``, closest first.
+        
+        Every pair includes at least one massive body (zero-mass test
+        particles have no mutual orbit to regularize).
+        
+        Returns:
+            (P, 2) array of object indices
+        """
+        radius = self.regularization_radius_m
+        if radius <= 0 or len(positions) < 2:
+            return np.empty((0, 2), dtype=int)
+        
+        # Candidate pairs from a blocked scan against the massive bodies; a
+        # massive-massive pair is kept once, from its lower index
+        massive = masses > 0
+        sources = np.flatnonzero(massive)
+        source_positions = positions[sources]
+        candidates_i, candidates_j, candidate_d = [], [], []
+        block_size = 1024
+        for start in range(0, len(positions), block_size):
+            stop = min(start + block_size, len(positions))
+            diff = source_positions[np.newaxis, :, :] - positions[start:stop, np.newaxis, :]
+            d = np.sqrt(np.einsum("tsk,tsk->ts", diff, diff))
+            rows, cols = np.nonzero((d < radius) & (d > 0))
+            i = rows + start
+            j = sources[cols]
+            keep = ~massive[i] | (j > i)
+            candidates_i.append(i[keep])
+            candidates_j.append(j[keep])
+            candidate_d.append(d[rows[keep], cols[keep]])
+        
+        i_all = np.concatenate(candidates_i)
+        j_all = np.concatenate(candidates_j)
+        order = np.argsort(np.concatenate(candidate_d))
+        
+        taken = np.zeros(len(positions), dtype=bool)
+        pairs = []
+        for i, j in zip(i_all[order], j_all[order]):
+            if not taken[i] and not taken[j]:
+                taken[i] = taken[j] = True
+                pairs.append((i, j))
+        return np.array(pairs, dtype=int).reshape(-1, 2)
+    
+    @staticmethod
+    def _drift(positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray,
+               pairs: np.ndarray, time_step: float) -> None:
+        """Drift bodies in place: straight lines, or KS two-body orbits for regularized pairs."""
+        if len(pairs) == 0:
+            positions += velocities * time_step
+            return
+        
+        a, b = pairs[:, 0], pairs[:, 1]
+        m_a = masses[a][:, np.newaxis]
+        m_b = masses[b][:, np.newaxis]
+        total = m_a + m_b
+        com_position = (m_a * positions[a] + m_b * positions[b]) / total
+        com_velocity = (m_a * velocities[a] + m_b * velocities[b]) / total
+        relative_position, relative_velocity = propagate_two_body_ks(
+            positions[b] - positions[a], velocities[b] - velocities[a],
+            PhysicalObject.GRAVITATIONAL_CONSTANT * total[:, 0], time_step
+        )
+        
+        positions += velocities * time_step
+        com_position += com_velocity * time_step
+        positions[a] = com_position - (m_b / total) * relative_position
+        positions[b] = com_position + (m_a / total) * relative_position
+        velocities[a] = com_velocity - (m_b / total) * relative_velocity
+        velocities[b] = com_velocity + (m_a / total) * relative_velocity
+    
+    def _star_index(self) -> Optional[int]:
+        """Return the index of the central object if it is a star."""
+        if self.central_object is None or self.central_object.object_type != ObjectType.STAR:
+            return None
+        return self._central_index()
+    
+    def _get_comet_activity(self) -> CometActivity:
+        """Return the comet activity arrays, rebuilding them if the system changed."""
+        activity = self._comet_activity
+        if activity is None or self._comet_object_count != len(self.objects):
+            indices = [i for i, obj in enumerate(self.objects)
+                       if obj.object_type == ObjectType.COMET and isinstance(obj, Comet)]
+            self._comet_indices = np.array(indices, dtype=int)
+            self._comet_object_count = len(self.objects)
+            activity = CometActivity([self.objects[i] for i in indices])
+            self._comet_activity = activity
+        
+        activity.update_interval = self.comet_update_interval
+        activity.distance_tolerance = self.comet_distance_tolerance
+        return activity
+
+
+def load_snapshot(path: str, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Load a snapshot written by :meth:`PhysicalSystem.save_snapshot`.
+    
+    No physical objects are constructed: the result maps column names to
+    NumPy arrays, so many snapshots can be scanned cheaply. Arrow IPC files
+    are memory-mapped and only the requested columns are read from Parquet
+    and ``.npz`` files.
+    
+    Args:
+        path: Snapshot file path
+        columns: Optional subset of column names to load
+        
+    Returns:
+        A dictionary of column name to array
+    """
+    ext = os.path.splitext(path)[1].lower()
+    
+    if ext == ".npz":
+        with np.load(path) as archive:
+            names = archive.files if columns is None else columns
+            return {name: archive[name] for name in names}
+    
+    if ext not in (".parquet", ".arrow", ".feather"):
+        raise ValueError(f"Unsupported snapshot format: {ext or path}")
+    if pa is None:
+        raise ImportError(f"pyarrow is required to read {path}")
+    
+    if ext == ".parquet":
+        return _table_to_columns(pq.read_table(path, columns=columns))
+    
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        # Convert while the mapping is still open
+        return _table_to_columns(table)
+
+
+def _table_to_columns(table: Any) -> Dict[str, np.ndarray]:
+    """Convert an Arrow table to a dictionary of NumPy columns."""
+    result = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            result[name] = np.array(column.to_pylist(), dtype=str)
+        else:
+            result[name] = column.to_numpy()
+    return result
 
 
 # Example usage
@@ -846,6 +2078,12 @@ if __name__ == "__main__":
         print(f"  10μm dust terminal velocity: {v_10:.2f} m/s")
         print(f"  50μm dust terminal velocity: {v_50:.2f} m/s")
         
+        # A log-normal aerosol population, settled in one array expression
+        aerosol = PhysicalObjectFactory.create_dust_population(1_000_000, 2.0, 2.0, 2500.0, seed=0)
+        settling = aerosol.terminal_velocities(air_density, earth_gravity)
+        print(f"  {len(aerosol):,} particle aerosol: median settling {np.median(settling) * 1e3:.3f} mm/s, "
+              f"fastest {settling.max():.3f} m/s")
+        
         # Get Earth's habitable zone from Sun
         habitable_zone = sun.habitable_zone
         print(f"\nSun's habitable zone:")
@@ -1,7 +1,7 @@
 from enum import Enum, auto
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Final, TypedDict, Set, ClassVar
-import numpy as np
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Final, TypedDict, Set, ClassVar, Mapping, Tuple
 
 # Type definitions for particle properties
 class QuarkProperties(TypedDict, total=False):
@@ -60,9 +60,19 @@ class Generation(Enum):
             return "N/A"
         return f"{self.value}ˢᵗ" if self.value == 1 else f"{self.value}ⁿᵈ" if self.value == 2 else f"{self.value}ʳᵈ"
 
-@dataclass
+# Interned catalog particles, keyed by (name, antiparticle, color)
+_PARTICLE_REGISTRY: Dict[Tuple[str, bool, Optional[str]], 'Particle'] = {}
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Particle:
-    """Base class for all particles in the Standard Model and beyond."""
+    """
+    Base class for all particles in the Standard Model and beyond.
+    
+    Particles are immutable flyweights: build catalog particles with
+    :meth:`create`, which returns the one shared instance per
+    (name, antiparticle, color). ``properties`` is a read-only mapping.
+    """
     
     name: str
     symbol: str
@@ -72,7 +82,11 @@ class Particle:
     particle_type: ParticleType
     antiparticle: bool = False
     generation: Generation = Generation.NONE
-    properties: Dict[str, Any] = field(default_factory=dict)
+    properties: Mapping[str, Any] = field(default_factory=dict)
+    
+    # Precomputed hash and the cached (interned) antiparticle
+    _hash: int = field(init=False, repr=False, compare=False, default=0)
+    _antiparticle: Optional['Particle'] = field(init=False, repr=False, compare=False, default=None)
     
     # Class constants
     SELF_ANTIPARTICLES: ClassVar[Set[str]] = {"Photon", "Z", "Higgs", "Graviton"}
@@ -82,6 +96,41 @@ class Particle:
         # Validation could be added here
         if self.mass_gev < 0:
             raise ValueError(f"Mass cannot be negative: {self.mass_gev}")
+        
+        # Subclasses add their entries to a private copy, which is then frozen
+        properties = dict(self.properties)
+        self._fill_properties(properties)
+        object.__setattr__(self, "properties", MappingProxyType(properties))
+        object.__setattr__(self, "_hash", hash((self.name, self.symbol, self.charge, self.antiparticle)))
+    
+    def _fill_properties(self, properties: Dict[str, Any]) -> None:
+        """Add subclass-specific entries to the properties being built."""
+    
+    @classmethod
+    def create(cls, *args, **kwargs) -> 'Particle':
+        """
+        Return the interned particle for these arguments, building it on first use.
+        
+        Particles are interned by (name, antiparticle, color), so repeated
+        calls (and repeated catalog construction) share one instance.
+        """
+        return cls._intern(cls(*args, **kwargs))
+    
+    @staticmethod
+    def _intern(particle: 'Particle') -> 'Particle':
+        """Return the registered instance equivalent to ``particle``."""
+        return _PARTICLE_REGISTRY.setdefault(particle.intern_key, particle)
+    
+    @property
+    def intern_key(self) -> Tuple[str, bool, Optional[str]]:
+        """Return the (name, antiparticle, color) key the particle is interned under."""
+        return (self.name, self.antiparticle, None)
+    
+    def __reduce__(self):
+        """Unpickle to the interned instance rather than a copy."""
+        kwargs = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+        kwargs["properties"] = dict(self.properties)
+        return (_unpickle_particle, (type(self), kwargs))
     
     def __repr__(self) -> str:
         """Return a string representation of the particle."""
@@ -90,6 +139,8 @@ class Particle:
     
     def __eq__(self, other) -> bool:
         """Compare two particles for equality."""
+        if self is other:
+            return True
         if not isinstance(other, Particle):
             return False
         return (self.name == other.name and 
@@ -98,8 +149,8 @@ class Particle:
                 self.antiparticle == other.antiparticle)
     
     def __hash__(self) -> int:
-        """Generate a hash for using particles in sets and as dict keys."""
-        return hash((self.name, self.symbol, self.charge, self.antiparticle))
+        """Return the hash precomputed from name, symbol, charge and antiparticle."""
+        return self._hash
     
     @property
     def rest_energy(self) -> float:
@@ -114,7 +165,7 @@ class Particle:
     @property
     def is_boson(self) -> bool:
         """Check if the particle is a boson (integer spin)."""
-        return self.spin.value.is_integer()
+        return float(self.spin.value).is_integer()
     
     @property
     def formatted_charge(self) -> str:
@@ -132,19 +183,30 @@ class Particle:
         return str(self.charge)
     
     def get_antiparticle(self):
-        """Create the antiparticle version if it exists."""
+        """
+        Return the antiparticle if it exists.
+        
+        The antiparticle is built and interned on the first call and cached in
+        both directions, so later calls (on either partner) allocate nothing.
+        """
         # Handle particles that are their own antiparticles
         if self.name in self.SELF_ANTIPARTICLES:
             return self
         
+        anti = self._antiparticle
+        if anti is None:
+            anti = self._intern(type(self)(**self._antiparticle_arguments()))
+            object.__setattr__(self, "_antiparticle", anti)
+            object.__setattr__(anti, "_antiparticle", self)
+        return anti
+    
+    def _antiparticle_arguments(self) -> Dict[str, Any]:
+        """Return the constructor arguments of the antiparticle."""
         # Create an antiparticle with inverted charge
         anti_name = f"Anti-{self.name}" if not self.antiparticle else self.name[5:]
         anti_symbol = self._get_anti_symbol()
         
-        # Create a copy of properties for the antiparticle
-        anti_props = self.properties.copy()
-        
-        return type(self)(
+        return dict(
             name=anti_name,
             symbol=anti_symbol,
             mass_gev=self.mass_gev,
@@ -153,9 +215,13 @@ class Particle:
             particle_type=self.particle_type,
             antiparticle=not self.antiparticle,
             generation=self.generation,
-            properties=anti_props
+            properties=self._antiparticle_properties()
         )
     
+    def _antiparticle_properties(self) -> Dict[str, Any]:
+        """Return the caller-supplied properties to carry over to the antiparticle."""
+        return dict(self.properties)
+    
     def _get_anti_symbol(self) -> str:
         """Generate the symbol for an antiparticle."""
         # This is a simplification - proper handling would use Unicode overbar
@@ -187,80 +253,87 @@ class Particle:
         return False
 
 
-@dataclass
+def _unpickle_particle(cls: type, kwargs: Dict[str, Any]) -> Particle:
+    """Rebuild a pickled particle as its interned instance."""
+    return cls.create(**kwargs)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Quark(Particle):
     """Specialized class for quarks with color charge."""
     
     # Additional quark-specific attributes
     color: str = "r"
     
-    def __post_init__(self) -> None:
+    ANTI_COLORS: ClassVar[Dict[str, str]] = {"r": "anti-r", "g": "anti-g", "b": "anti-b", 
+                                              "anti-r": "r", "anti-g": "g", "anti-b": "b"}
+    
+    def _fill_properties(self, properties: Dict[str, Any]) -> None:
         """Initialize quark-specific properties."""
-        super().__post_init__()
         # Store color in properties
-        self.properties["color"] = self.color
-        self.properties["confined"] = True
+        properties["color"] = self.color
+        properties["confined"] = True
     
-    def get_antiparticle(self):
+    @property
+    def intern_key(self) -> Tuple[str, bool, Optional[str]]:
+        """Return the (name, antiparticle, color) key the quark is interned under."""
+        return (self.name, self.antiparticle, self.color)
+    
+    def _antiparticle_arguments(self) -> Dict[str, Any]:
         """Create the antiquark with opposite charge and color."""
-        anti_colors = {"r": "anti-r", "g": "anti-g", "b": "anti-b", 
-                      "anti-r": "r", "anti-g": "g", "anti-b": "b"}
-        
-        anti = Quark(
-            name=f"Anti-{self.name}" if not self.antiparticle else self.name[5:],
-            symbol=self._get_anti_symbol(),
-            mass_gev=self.mass_gev,
-            charge=-self.charge,
-            spin=self.spin,
-            particle_type=self.particle_type,
-            antiparticle=not self.antiparticle,
-            generation=self.generation,
-            color=anti_colors[self.color]
-        )
-        return anti
+        arguments = Particle._antiparticle_arguments(self)
+        arguments["color"] = self.ANTI_COLORS[self.color]
+        return arguments
+    
+    def _antiparticle_properties(self) -> Dict[str, Any]:
+        """Quark properties are all derived, so nothing is carried over."""
+        return {}
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=False)
 class Lepton(Particle):
     """Specialized class for leptons."""
     
     # Additional lepton-specific attributes
     is_neutrino: bool = False
     
-    def __post_init__(self) -> None:
+    def _fill_properties(self, properties: Dict[str, Any]) -> None:
         """Initialize lepton-specific properties."""
-        super().__post_init__()
-        self.properties["is_neutrino"] = self.is_neutrino
-        self.properties["lepton_number"] = 1  # +1 for leptons, -1 for antileptons (set in get_antiparticle)
+        properties["is_neutrino"] = self.is_neutrino
+        properties["lepton_number"] = -1 if self.antiparticle else 1  # +1 for leptons, -1 for antileptons
     
-    def get_antiparticle(self):
+    def _antiparticle_arguments(self) -> Dict[str, Any]:
         """Create the antilepton with opposite charge and lepton number."""
-        anti = super().get_antiparticle()
-        if isinstance(anti, Lepton):
-            anti.properties["lepton_number"] = -1 if self.properties["lepton_number"] == 1 else 1
-        return anti
+        arguments = Particle._antiparticle_arguments(self)
+        arguments["is_neutrino"] = self.is_neutrino
+        return arguments
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=False)
 class GaugeBoson(Particle):
     """Specialized class for gauge bosons (force carriers)."""
     
     # Additional boson-specific attributes
     mediates: Force = None
     
-    def __post_init__(self) -> None:
+    def _fill_properties(self, properties: Dict[str, Any]) -> None:
         """Initialize boson-specific properties."""
-        super().__post_init__()
         if self.mediates:
-            self.properties["mediates"] = self.mediates
+            properties["mediates"] = self.mediates
             
             # Set range based on force type
             if self.mediates == Force.ELECTROMAGNETIC or self.mediates == Force.GRAVITATIONAL:
-                self.properties["range"] = float('inf')  # Infinite range
+                properties["range"] = float('inf')  # Infinite range
             elif self.mediates == Force.WEAK:
-                self.properties["range"] = 1e-18  # ~10^-18 m
+                properties["range"] = 1e-18  # ~10^-18 m
             elif self.mediates == Force.STRONG:
-                self.properties["range"] = 1e-15  # ~10^-15 m (nuclear scale)
+                properties["range"] = 1e-15  # ~10^-15 m (nuclear scale)
+    
+    def _antiparticle_arguments(self) -> Dict[str, Any]:
+        """Create the antiboson mediating the same force."""
+        arguments = Particle._antiparticle_arguments(self)
+        arguments["mediates"] = self.mediates
+        return arguments
 
 
 class ParticleFactory:
@@ -270,39 +343,39 @@ class ParticleFactory:
     def create_quarks() -> List[Quark]:
         """Create all Standard Model quarks."""
         return [
-            Quark("Up", "u", 0.0022, 2/3, Spin.HALF, ParticleType.QUARK, generation=Generation.FIRST),
-            Quark("Down", "d", 0.0047, -1/3, Spin.HALF, ParticleType.QUARK, generation=Generation.FIRST),
-            Quark("Charm", "c", 1.27, 2/3, Spin.HALF, ParticleType.QUARK, generation=Generation.SECOND),
-            Quark("Strange", "s", 0.093, -1/3, Spin.HALF, ParticleType.QUARK, generation=Generation.SECOND),
-            Quark("Top", "t", 172.76, 2/3, Spin.HALF, ParticleType.QUARK, generation=Generation.THIRD),
-            Quark("Bottom", "b", 4.18, -1/3, Spin.HALF, ParticleType.QUARK, generation=Generation.THIRD)
+            Quark.create("Up", "u", 0.0022, 2/3, Spin.HALF, ParticleType.QUARK, generation=Generation.FIRST),
+            Quark.create("Down", "d", 0.0047, -1/3, Spin.HALF, ParticleType.QUARK, generation=Generation.FIRST),
+            Quark.create("Charm", "c", 1.27, 2/3, Spin.HALF, ParticleType.QUARK, generation=Generation.SECOND),
+            Quark.create("Strange", "s", 0.093, -1/3, Spin.HALF, ParticleType.QUARK, generation=Generation.SECOND),
+            Quark.create("Top", "t", 172.76, 2/3, Spin.HALF, ParticleType.QUARK, generation=Generation.THIRD),
+            Quark.create("Bottom", "b", 4.18, -1/3, Spin.HALF, ParticleType.QUARK, generation=Generation.THIRD)
         ]
     
     @staticmethod
     def create_leptons() -> List[Lepton]:
         """Create all Standard Model leptons."""
         return [
-            Lepton("Electron", "e", 0.000511, -1, Spin.HALF, ParticleType.LEPTON, generation=Generation.FIRST),
-            Lepton("Electron Neutrino", "νₑ", 1e-9, 0, Spin.HALF, ParticleType.LEPTON, generation=Generation.FIRST, is_neutrino=True),
-            Lepton("Muon", "μ", 0.106, -1, Spin.HALF, ParticleType.LEPTON, generation=Generation.SECOND),
-            Lepton("Muon Neutrino", "νᵤ", 1e-9, 0, Spin.HALF, ParticleType.LEPTON, generation=Generation.SECOND, is_neutrino=True),
-            Lepton("Tau", "τ", 1.777, -1, Spin.HALF, ParticleType.LEPTON, generation=Generation.THIRD),
-            Lepton("Tau Neutrino", "νᵧ", 1e-9, 0, Spin.HALF, ParticleType.LEPTON, generation=Generation.THIRD, is_neutrino=True)
+            Lepton.create("Electron", "e", 0.000511, -1, Spin.HALF, ParticleType.LEPTON, generation=Generation.FIRST),
+            Lepton.create("Electron Neutrino", "νₑ", 1e-9, 0, Spin.HALF, ParticleType.LEPTON, generation=Generation.FIRST, is_neutrino=True),
+            Lepton.create("Muon", "μ", 0.106, -1, Spin.HALF, ParticleType.LEPTON, generation=Generation.SECOND),
+            Lepton.create("Muon Neutrino", "νᵤ", 1e-9, 0, Spin.HALF, ParticleType.LEPTON, generation=Generation.SECOND, is_neutrino=True),
+            Lepton.create("Tau", "τ", 1.777, -1, Spin.HALF, ParticleType.LEPTON, generation=Generation.THIRD),
+            Lepton.create("Tau Neutrino", "νᵧ", 1e-9, 0, Spin.HALF, ParticleType.LEPTON, generation=Generation.THIRD, is_neutrino=True)
         ]
     
     @staticmethod
     def create_bosons() -> List[Particle]:
         """Create all Standard Model bosons."""
         gauge_bosons = [
-            GaugeBoson("Photon", "γ", 0, 0, Spin.ONE, ParticleType.GAUGE_BOSON, mediates=Force.ELECTROMAGNETIC),
-            GaugeBoson("W Plus", "W⁺", 80.4, 1, Spin.ONE, ParticleType.GAUGE_BOSON, mediates=Force.WEAK),
-            GaugeBoson("W Minus", "W⁻", 80.4, -1, Spin.ONE, ParticleType.GAUGE_BOSON, antiparticle=True, mediates=Force.WEAK),
-            GaugeBoson("Z", "Z", 91.2, 0, Spin.ONE, ParticleType.GAUGE_BOSON, mediates=Force.WEAK),
-            GaugeBoson("Gluon", "g", 0, 0, Spin.ONE, ParticleType.GAUGE_BOSON, mediates=Force.STRONG)
+            GaugeBoson.create("Photon", "γ", 0, 0, Spin.ONE, ParticleType.GAUGE_BOSON, mediates=Force.ELECTROMAGNETIC),
+            GaugeBoson.create("W Plus", "W⁺", 80.4, 1, Spin.ONE, ParticleType.GAUGE_BOSON, mediates=Force.WEAK),
+            GaugeBoson.create("W Minus", "W⁻", 80.4, -1, Spin.ONE, ParticleType.GAUGE_BOSON, antiparticle=True, mediates=Force.WEAK),
+            GaugeBoson.create("Z", "Z", 91.2, 0, Spin.ONE, ParticleType.GAUGE_BOSON, mediates=Force.WEAK),
+            GaugeBoson.create("Gluon", "g", 0, 0, Spin.ONE, ParticleType.GAUGE_BOSON, mediates=Force.STRONG)
         ]
         
         # Higgs boson
-        higgs = Particle(
+        higgs = Particle.create(
             name="Higgs",
             symbol="H",
             mass_gev=125.25,
@@ -317,7 +390,7 @@ class ParticleFactory:
     def create_bsm_particles() -> List[Particle]:
         """Create example Beyond Standard Model particles."""
         return [
-            Particle(
+            Particle.create(
                 name="Graviton",
                 symbol="G",
                 mass_gev=0,
@@ -326,7 +399,7 @@ class ParticleFactory:
                 particle_type=ParticleType.THEORETICAL,
                 properties={"mediates": Force.GRAVITATIONAL}
             ),
-            Particle(
+            Particle.create(
                 name="Selectron",
                 symbol="ẽ",
                 mass_gev=500,  # Hypothetical mass
@@ -338,6 +411,9 @@ class ParticleFactory:
         ]
 
 
+# Process-wide read-only catalogs, keyed by (include_antiparticles, include_bsm)
+_SHARED_MODELS: Dict[Tuple[bool, bool], 'StandardModel'] = {}
+
 class StandardModel:
     """Class to represent the entire Standard Model of particle physics."""
     
@@ -350,32 +426,88 @@ class StandardModel:
             include_bsm: Whether to include Beyond Standard Model particles
         """
         self.particles = []
+        self._frozen = False
+        
+        # Lookup indexes, maintained by add_particle
+        self._by_name: Dict[str, Particle] = {}
+        self._by_symbol: Dict[str, Particle] = {}
+        self._by_folded_symbol: Dict[str, Particle] = {}
+        self._by_type: Dict[ParticleType, List[Particle]] = {t: [] for t in ParticleType}
+        self._by_force: Dict[Force, List[Particle]] = {f: [] for f in Force}
+        
         self._initialize_particles(include_antiparticles, include_bsm)
     
+    @classmethod
+    def shared(cls, include_antiparticles: bool = True, include_bsm: bool = False) -> 'StandardModel':
+        """
+        Return the process-wide, frozen catalog for a configuration.
+        
+        The first call in a process builds and freezes the catalog; later
+        calls return the same instance. Building takes under a millisecond,
+        so the catalog is not cached on disk.
+        """
+        key = (include_antiparticles, include_bsm)
+        model = _SHARED_MODELS.get(key)
+        if model is None:
+            model = cls(include_antiparticles, include_bsm)
+            model.freeze()
+            _SHARED_MODELS[key] = model
+        return model
+    
+    def freeze(self) -> None:
+        """Make the catalog read-only so it can be shared safely."""
+        self.particles = tuple(self.particles)
+        self._frozen = True
+    
     def _initialize_particles(self, include_antiparticles: bool, include_bsm: bool) -> None:
         """Initialize all particles in the Standard Model."""
         # Use the factory to create particles
         factory = ParticleFactory()
         
         # Add Standard Model particles
-        self.particles.extend(factory.create_quarks())
-        self.particles.extend(factory.create_leptons())
-        self.particles.extend(factory.create_bosons())
+        particles = factory.create_quarks() + factory.create_leptons() + factory.create_bosons()
         
         # Optionally add Beyond Standard Model particles
         if include_bsm:
-            self.particles.extend(factory.create_bsm_particles())
+            particles.extend(factory.create_bsm_particles())
         
         # Add antiparticles if requested
         if include_antiparticles:
             # Filter particles that need antiparticles
-            need_antiparticle = [p for p in self.particles if 
+            need_antiparticle = [p for p in particles if 
                                 p.name not in Particle.SELF_ANTIPARTICLES and 
                                 not p.antiparticle]
             
             # Create and add antiparticles
-            for particle in need_antiparticle:
-                self.particles.append(particle.get_antiparticle())
+            particles.extend(particle.get_antiparticle() for particle in need_antiparticle)
+        
+        for particle in particles:
+            self.add_particle(particle)
+    
+    def add_particle(self, particle: Particle) -> None:
+        """
+        Add a particle to the catalog and its lookup indexes.
+        
+        Always add particles through this method rather than appending to
+        ``particles`` directly, so that the lookups stay consistent. When
+        names or symbols collide, lookups keep returning the earlier particle.
+        
+        Args:
+            particle: The particle to add
+            
+        Raises:
+            TypeError: If the catalog is frozen
+        """
+        if self._frozen:
+            raise TypeError("Cannot add particles to a frozen catalog")
+        self.particles.append(particle)
+        self._by_name.setdefault(particle.name.casefold(), particle)
+        self._by_symbol.setdefault(particle.symbol, particle)
+        self._by_folded_symbol.setdefault(particle.symbol.casefold(), particle)
+        self._by_type[particle.particle_type].append(particle)
+        for force in Force:
+            if particle.interacts_via(force):
+                self._by_force[force].append(particle)
     
     def get_particle_by_name(self, name: str) -> Optional[Particle]:
         """
@@ -387,10 +519,25 @@ class StandardModel:
         Returns:
             The particle object if found, None otherwise
         """
-        for particle in self.particles:
-            if particle.name.lower() == name.lower():
-                return particle
-        return None
+        return self._by_name.get(name.casefold())
+    
+    def get_particle_by_symbol(self, symbol: str) -> Optional[Particle]:
+        """
+        Retrieve a particle by its symbol.
+        
+        An exact match wins (so "g" and "G" stay distinct); otherwise the
+        lookup falls back to a case-insensitive match.
+        
+        Args:
+            symbol: The symbol of the particle to find
+            
+        Returns:
+            The particle object if found, None otherwise
+        """
+        particle = self._by_symbol.get(symbol)
+        if particle is None:
+            particle = self._by_folded_symbol.get(symbol.casefold())
+        return particle
     
     def get_particles_by_type(self, particle_type: ParticleType) -> List[Particle]:
         """
@@ -402,7 +549,7 @@ class StandardModel:
         Returns:
             A list of particles matching the specified type
         """
-        return [p for p in self.particles if p.particle_type == particle_type]
+        return list(self._by_type[particle_type])
     
     def get_particles_by_force(self, force: Force) -> List[Particle]:
         """
@@ -414,7 +561,7 @@ class StandardModel:
         Returns:
             A list of particles that interact via the specified force
         """
-        return [p for p in self.particles if p.interacts_via(force)]
+        return list(self._by_force[force])
     
     def print_summary(self) -> None:
         """Print a summary of all particles in the Standard Model."""
@@ -1,44 +1,467 @@
 #!/usr/bin/env python3
-import re
-import sys
+import argparse
+import codecs
+import hashlib
+import json
+import mmap
 import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+# Define regex pattern for all Unicode space characters
+# This includes regular space, non-breaking space, en space, em space,
+# thin space, hair space, zero-width space, and others
+SPACE_PATTERN = re.compile(r'[\u0020\u00A0\u2000-\u200A\u202F\u205F\u3000\uFEFF]')
+
+# The same characters, minus U+0020 itself, as replaced by the translate engine
+SPACE_CHARACTERS = '\u00A0' + ''.join(map(chr, range(0x2000, 0x200B))) + '\u202F\u205F\u3000\uFEFF'
+
+# File extensions processed in directories unless configured otherwise
+EXTENSIONS = ('.md', '.txt')
+
+# Replacement engines, fastest first: 'replace' (str.replace per character present),
+# 'translate' (a precomputed str.translate table) and 'regex' (the original pattern)
+ENGINES = ('replace', 'translate', 'regex')
+
+# Bytes read per chunk when streaming a file
+CHUNK_SIZE = 1 << 20
+
+# Default manifest of files known to be clean, kept at the root of a processed tree
+MANIFEST_NAME = '.space_standardizer.sqlite'
+
+def parse_characters(spec):
+    """Parse a character set like "00A0,2000-200A,U+3000" into a string of characters"""
+    characters = []
+    for part in spec.split(','):
+        part = part.strip().upper().replace('U+', '')
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        characters.extend(map(chr, range(int(first, 16), int(last or first, 16) + 1)))
+    return ''.join(characters)
+
+@lru_cache(maxsize=None)
+def _replacer(characters, engine):
+    """Return (replace(text) -> text, ascii_is_clean) for a character set and engine
+    
+    ascii_is_clean is True when no ASCII character needs replacing, so
+    pure-ASCII bytes can be passed through without decoding.
+    """
+    if engine == 'regex':
+        pattern = SPACE_PATTERN if characters == SPACE_CHARACTERS else \
+            re.compile('[ ' + ''.join(map(re.escape, characters)) + ']')
+        return partial(pattern.sub, ' '), False
+    targets = tuple(c for c in characters if c != ' ')
+    ascii_is_clean = all(ord(c) >= 0x80 for c in targets)
+    if engine == 'translate':
+        table = str.maketrans({c: ' ' for c in targets})
+        return (lambda text: text.translate(table)), ascii_is_clean
+    if engine == 'replace':
+        # Each "in" test and replace is a fast substring search, unlike the
+        # per-character table lookups str.translate does for non-ASCII text
+        def replace(text):
+            for c in targets:
+                if c in text:
+                    text = text.replace(c, ' ')
+            return text
+        return replace, ascii_is_clean
+    raise ValueError(f"Unknown engine: {engine}")
 
-def standardize_spaces(file_path):
-    """Replace all Unicode space characters with standard space (U+0020)"""
+def standardize_spaces(file_path, chunk_size=CHUNK_SIZE, characters=SPACE_CHARACTERS, engine='replace'):
+    """Replace all Unicode space characters with standard space (U+0020)
     
-    # Read the file content
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
+    The file is streamed in chunks through an incremental UTF-8 decoder, so
+    multi-byte characters split across chunks are handled. Nothing is written
+    unless a replacement is made; otherwise the result goes to a temporary
+    file next to the original, which then replaces it atomically.
     
-    # Define regex pattern for all Unicode space characters
-    # This includes regular space, non-breaking space, en space, em space, 
-    # thin space, hair space, zero-width space, and others
-    space_pattern = r'[\u0020\u00A0\u2000-\u200A\u202F\u205F\u3000\uFEFF]'
+    Returns True if the file was rewritten.
+    """
+    return _standardize_file(file_path, chunk_size, characters, engine)[0]
+
+def _standardize_file(file_path, chunk_size=CHUNK_SIZE, characters=SPACE_CHARACTERS, engine='replace'):
+    """Standardize a file and fingerprint the result
     
-    # Replace all space characters with a standard space
-    standardized_content = re.sub(space_pattern, ' ', content)
+    Returns (changed, size, mtime_ns, sha256 hex digest) of the file as it
+    is after processing.
+    """
+    replace, ascii_is_clean = _replacer(characters, engine)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    digest = hashlib.sha256()
+    unchanged_bytes = 0
+    temp_file = None
     
-    # Write the standardized content back to the file
-    with open(file_path, 'w', encoding='utf-8') as file:
-        file.write(standardized_content)
+    try:
+        with open(file_path, 'rb') as source:
+            source_stat = os.fstat(source.fileno())
+            while True:
+                raw = source.read(chunk_size)
+                
+                # Pure-ASCII chunks (with no partial character pending) need no decoding
+                if raw and ascii_is_clean and raw.isascii() and not decoder.getstate()[0]:
+                    if temp_file is not None:
+                        temp_file.write(raw)
+                    else:
+                        unchanged_bytes += len(raw)
+                    digest.update(raw)
+                    continue
+                
+                content = decoder.decode(raw, final=not raw)
+                
+                # Replace all space characters with a standard space
+                standardized_content = replace(content)
+                
+                if temp_file is None and standardized_content != content:
+                    # First change: start the output with the untouched prefix
+                    temp_file = tempfile.NamedTemporaryFile(
+                        dir=os.path.dirname(os.path.abspath(file_path)),
+                        prefix='.' + os.path.basename(file_path) + '.', suffix='.tmp', delete=False)
+                    digest = hashlib.sha256()
+                    with open(file_path, 'rb') as prefix:
+                        _copy_bytes(prefix, temp_file, unchanged_bytes, digest)
+                
+                if temp_file is not None:
+                    data = standardized_content.encode('utf-8')
+                    temp_file.write(data)
+                    digest.update(data)
+                else:
+                    digest.update(raw)
+                    # Bytes consumed so far, minus a partial character held by the decoder
+                    unchanged_bytes = source.tell() - len(decoder.getstate()[0])
+                
+                if not raw:
+                    break
+        
+        if temp_file is None:
+            return False, source_stat.st_size, source_stat.st_mtime_ns, digest.hexdigest()
+        
+        # Write the standardized content back to the file
+        temp_file.close()
+        shutil.copymode(file_path, temp_file.name)
+        os.replace(temp_file.name, file_path)
+        temp_file = None
+        result_stat = os.stat(file_path)
+        return True, result_stat.st_size, result_stat.st_mtime_ns, digest.hexdigest()
+    finally:
+        if temp_file is not None:
+            temp_file.close()
+            os.unlink(temp_file.name)
+
+def _file_digest(file_path, chunk_size=CHUNK_SIZE):
+    """Return the sha256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for data in iter(lambda: file.read(chunk_size), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+def _process_file(file_path, known_digest=None, chunk_size=CHUNK_SIZE, characters=SPACE_CHARACTERS,
+                  engine='replace'):
+    """Worker: standardize a file unless its content matches a known clean digest
     
-    print(f"Standardized spaces in: {file_path}")
+    A file whose mtime changed but whose content hash did not (for example
+    after a checkout or touch) is only hashed, not decoded and scanned.
+    A file that is not valid UTF-8 or cannot be read or written is left
+    untouched and reported as (None, error message), so one bad file does
+    not abort the whole run.
+    """
+    try:
+        if known_digest is not None:
+            file_stat = os.stat(file_path)
+            if _file_digest(file_path, chunk_size) == known_digest:
+                return False, file_stat.st_size, file_stat.st_mtime_ns, known_digest
+        return _standardize_file(file_path, chunk_size, characters, engine)
+    except UnicodeDecodeError as error:
+        return None, f"not valid UTF-8 ({error.reason})"
+    except OSError as error:
+        return None, error.strerror or str(error)
 
-def process_directory(directory_path):
-    """Process all files in a directory"""
+def _copy_bytes(source, destination, count, digest, buffer_size=CHUNK_SIZE):
+    """Copy the first count bytes of source to destination, adding them to digest"""
+    while count > 0:
+        data = source.read(min(buffer_size, count))
+        if not data:
+            break
+        destination.write(data)
+        digest.update(data)
+        count -= len(data)
+
+def find_files(directory_path, extensions=EXTENSIONS):
+    """Yield the paths of all files in a directory tree with the given extensions"""
+    extensions = tuple(extensions)
     for root, _, files in os.walk(directory_path):
         for file_name in files:
-            if file_name.endswith(('.md', '.txt')):
-                file_path = os.path.join(root, file_name)
-                standardize_spaces(file_path)
+            if file_name.endswith(extensions):
+                yield os.path.join(root, file_name)
+
+def open_manifest(manifest_path, characters=SPACE_CHARACTERS):
+    """Open (creating if needed) the manifest of files known to be clean
+    
+    "Clean" depends on the character set, so the manifest is emptied when
+    it was built for different characters.
+    """
+    connection = sqlite3.connect(manifest_path)
+    with connection:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS clean_files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT)")
+        connection.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
+        character_key = ','.join(f"{ord(c):04X}" for c in sorted(set(characters)))
+        row = connection.execute("SELECT value FROM settings WHERE key = 'characters'").fetchone()
+        if row is None or row[0] != character_key:
+            connection.execute("DELETE FROM clean_files")
+            connection.execute("INSERT OR REPLACE INTO settings VALUES ('characters', ?)", (character_key,))
+    return connection
+
+def process_directory(directory_path, workers=None, chunk_size=CHUNK_SIZE, manifest_path=None,
+                      use_manifest=True, extensions=EXTENSIONS, characters=SPACE_CHARACTERS,
+                      engine='replace'):
+    """Process all files in a directory
+    
+    Files are spread over a pool of worker processes (one per core by
+    default; workers=1 runs in this process). Unless use_manifest is False,
+    a manifest of (path, size, mtime, content hash) of clean files is kept
+    (by default in MANIFEST_NAME at the root of the tree), and files whose
+    size and mtime still match it are skipped without being opened. Files
+    that fail (invalid UTF-8, I/O errors) are left out of the manifest and
+    listed at the end. Returns the number of files that were rewritten.
+    """
+    file_paths = list(find_files(directory_path, extensions))
+    manifest = None
+    known = {}
+    if use_manifest:
+        manifest = open_manifest(manifest_path or os.path.join(directory_path, MANIFEST_NAME), characters)
+        known = {path: (size, mtime_ns, sha256) for path, size, mtime_ns, sha256
+                 in manifest.execute("SELECT path, size, mtime_ns, sha256 FROM clean_files")}
+    
+    # Keep only new or modified files; same-size files get their old hash to compare
+    pending = []
+    for file_path in file_paths:
+        relative_path = os.path.relpath(file_path, directory_path)
+        entry = known.get(relative_path)
+        if entry is None:
+            pending.append((file_path, relative_path, None))
+            continue
+        file_stat = os.stat(file_path)
+        if (file_stat.st_size, file_stat.st_mtime_ns) == entry[:2]:
+            continue
+        pending.append((file_path, relative_path, entry[2] if file_stat.st_size == entry[0] else None))
+    
+    worker = partial(_process_file, chunk_size=chunk_size, characters=characters, engine=engine)
+    paths = [item[0] for item in pending]
+    digests = [item[2] for item in pending]
+    try:
+        if workers == 1:
+            results = list(map(worker, paths, digests))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(worker, paths, digests, chunksize=16))
+        
+        if manifest is not None:
+            current = {os.path.relpath(path, directory_path) for path in file_paths}
+            with manifest:
+                manifest.executemany(
+                    "INSERT OR REPLACE INTO clean_files VALUES (?, ?, ?, ?)",
+                    [(item[1],) + tuple(result[1:]) for item, result in zip(pending, results)
+                     if result[0] is not None])
+                manifest.executemany("DELETE FROM clean_files WHERE path = ?",
+                                     [(path,) for path in known if path not in current])
+    finally:
+        if manifest is not None:
+            manifest.close()
+    
+    print(f"{len(file_paths) - len(pending)} unchanged files skipped via the manifest")
+    return _report(paths, results)
+
+def _report(file_paths, results):
+    """Print the rewritten and failed files and return how many were rewritten"""
+    changed = 0
+    failures = []
+    for file_path, result in zip(file_paths, results):
+        if result[0] is None:
+            failures.append((file_path, result[1]))
+        elif result[0]:
+            changed += 1
+            print(f"Standardized spaces in: {file_path}")
+    print(f"{changed} of {len(file_paths)} files changed")
+    if failures:
+        print(f"{len(failures)} files could not be processed and were left unchanged:")
+        for file_path, message in failures:
+            print(f"  {file_path}: {message}")
+    return changed
+
+# Any byte outside ASCII; used to skip pure-ASCII files in scans
+_NON_ASCII_BYTE = re.compile(b'[\x80-\xff]')
+
+@lru_cache(maxsize=None)
+def _scan_pattern(characters):
+    """Return a bytes pattern matching the UTF-8 encoding of any target character
+    
+    Returns None when there is nothing to find (U+0020 itself is never a target).
+    """
+    targets = sorted({c for c in characters if c != ' '}, key=ord)
+    if not targets:
+        return None
+    return re.compile(b'|'.join(re.escape(c.encode('utf-8')) for c in targets))
+
+def scan_file(file_path, characters=SPACE_CHARACTERS):
+    """Count the target characters in a file without modifying it
+    
+    The file is memory-mapped and searched as bytes; UTF-8 sequences are
+    self-synchronizing, so matching encoded characters counts characters.
+    Files with no bytes >= 0x80 are dismissed after one scan when all
+    targets are non-ASCII. Returns {"U+XXXX": count} for characters found.
+    """
+    pattern = _scan_pattern(characters)
+    if pattern is None:
+        return {}
+    ascii_is_clean = all(ord(c) >= 0x80 or c == ' ' for c in characters)
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if ascii_is_clean and _NON_ASCII_BYTE.search(mapped) is None:
+                return {}
+            counts = Counter(pattern.findall(mapped))
+    return {f"U+{ord(encoded.decode('utf-8')):04X}": count for encoded, count in sorted(counts.items())}
+
+def _scan_file(file_path, characters=SPACE_CHARACTERS):
+    """Worker: scan a file, reporting (None, error message) if it cannot be read
+    
+    An unreadable file or broken symlink is reported instead of aborting
+    the whole scan, as in _process_file.
+    """
+    try:
+        return scan_file(file_path, characters), None
+    except OSError as error:
+        return None, error.strerror or str(error)
+
+def scan_files(file_paths, root, workers=None, characters=SPACE_CHARACTERS):
+    """Build a read-only report of which files contain which target characters
+    
+    Files are scanned in a pool of worker processes (workers=1 scans in
+    this process). Returns a JSON-serializable dict with per-character
+    totals and, keyed by path relative to root, per-file counts for the
+    files that contain any and error messages for the files that could
+    not be read.
+    """
+    worker = partial(_scan_file, characters=characters)
+    if workers == 1:
+        results = list(map(worker, file_paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(worker, file_paths, chunksize=16))
+    
+    totals = Counter()
+    files = {}
+    errors = {}
+    for file_path, (counts, error) in zip(file_paths, results):
+        if error is not None:
+            errors[os.path.relpath(file_path, root)] = error
+        elif counts:
+            files[os.path.relpath(file_path, root)] = counts
+            totals.update(counts)
+    
+    return {
+        "root": os.path.abspath(root),
+        "characters": [f"U+{ord(c):04X}" for c in sorted({c for c in characters if c != ' '}, key=ord)],
+        "files_scanned": len(file_paths),
+        "files_with_matches": len(files),
+        "totals": dict(sorted(totals.items())),
+        "files": dict(sorted(files.items())),
+        "errors": dict(sorted(errors.items())),
+    }
+
+def scan_directory(directory_path, workers=None, extensions=EXTENSIONS, characters=SPACE_CHARACTERS):
+    """Scan all files in a directory tree with the given extensions (see scan_files)"""
+    return scan_files(list(find_files(directory_path, extensions)), directory_path, workers, characters)
+
+def benchmark(file_paths, characters=SPACE_CHARACTERS, repeat=3):
+    """Time each engine on file contents held in memory, without writing anything
+    
+    Returns {engine: throughput in MB/s}, using the best of repeat runs.
+    """
+    contents = []
+    for file_path in file_paths:
+        with open(file_path, 'rb') as file:
+            contents.append(file.read())
+    total_bytes = sum(map(len, contents))
+    
+    throughput = {}
+    for engine in ENGINES:
+        replace, ascii_is_clean = _replacer(characters, engine)
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for data in contents:
+                if ascii_is_clean and data.isascii():
+                    continue
+                replace(data.decode('utf-8'))
+            best = min(best, time.perf_counter() - start)
+        throughput[engine] = total_bytes / 1e6 / best if best > 0 else float('inf')
+        print(f"{engine:>9}: {throughput[engine]:10.1f} MB/s over {len(contents)} files ({total_bytes / 1e6:.1f} MB)")
+    return throughput
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        path = sys.argv[1]
-        if os.path.isfile(path):
-            standardize_spaces(path)
+    parser = argparse.ArgumentParser(
+        description="Replace Unicode space characters with standard spaces in text files")
+    parser.add_argument("path", nargs="?", help="file or directory to process")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for directories (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="bytes read per chunk (default: %(default)s)")
+    parser.add_argument("--manifest", default=None,
+                        help=f"manifest database for directories (default: <directory>/{MANIFEST_NAME})")
+    parser.add_argument("--no-manifest", action="store_true",
+                        help="scan every file instead of skipping ones recorded as clean")
+    parser.add_argument("--engine", choices=ENGINES, default='replace',
+                        help="replacement engine (default: %(default)s)")
+    parser.add_argument("--chars", default=None,
+                        help="code points to replace, e.g. 00A0,2000-200A,3000 (default: all Unicode spaces)")
+    parser.add_argument("--ext", default=','.join(EXTENSIONS),
+                        help="comma-separated file extensions for directories (default: %(default)s)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare the engines on the files without modifying them")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only count the characters that would be replaced and print a JSON report")
+    parser.add_argument("--report", default=None,
+                        help="write the --dry-run report to this file instead of standard output")
+    args = parser.parse_args()
+    
+    characters = parse_characters(args.chars) if args.chars else SPACE_CHARACTERS
+    if not characters.replace(' ', ''):
+        parser.error(f"--chars {args.chars} selects no characters to replace (U+0020 is the replacement)")
+    extensions = tuple(ext if ext.startswith('.') else '.' + ext
+                       for ext in (e.strip() for e in args.ext.split(',')) if ext)
+    
+    if args.path:
+        path = args.path
+        if not os.path.exists(path):
+            print(f"Error: {path} is not a valid file or directory")
+        elif args.dry_run:
+            if os.path.isfile(path):
+                report = scan_files([path], os.path.dirname(path) or '.', 1, characters)
+            else:
+                report = scan_directory(path, args.workers, extensions, characters)
+            if args.report:
+                with open(args.report, 'w', encoding='utf-8') as file:
+                    json.dump(report, file, indent=2)
+            else:
+                print(json.dumps(report, indent=2))
+        elif args.benchmark:
+            benchmark([path] if os.path.isfile(path) else list(find_files(path, extensions)), characters)
+        elif os.path.isfile(path):
+            if standardize_spaces(path, args.chunk_size, characters, args.engine):
+                print(f"Standardized spaces in: {path}")
         elif os.path.isdir(path):
-            process_directory(path)
+            process_directory(path, args.workers, args.chunk_size, args.manifest, not args.no_manifest,
+                              extensions, characters, args.engine)
         else:
             print(f"Error: {path} is not a valid file or directory")
     else:
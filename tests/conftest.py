@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The scripts are not packaged; import them from where they live
+for directory in (ROOT, os.path.join(ROOT, 'Sections', 'code', 'Python')):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from decay_generator import STATUS_DECAYED, DecayGenerator, DecayTable
+from tsm import StandardModel
+
+
+def test_batches_are_event_ordered_and_conserve_momentum():
+    sm = StandardModel.shared()
+    generator = DecayGenerator(DecayTable.standard(sm), seed=5)
+    top = sm.get_particle_by_name("Top")
+
+    batches = list(generator.generate(top, 5_000, batch_size=2_000, parent_momentum=(0, 0, 100.0)))
+    sharded = list(generator.generate(top, 5_000, batch_size=2_000, parent_momentum=(0, 0, 100.0),
+                                      processes=2))
+    assert [b.tobytes() for b in batches] == [b.tobytes() for b in sharded]
+
+    for batch in batches:
+        rows = np.arange(len(batch))
+        child = batch["parent"] >= 0
+        parent = batch["parent"][child]
+        assert np.all(np.diff(batch["event"].astype(np.int64)) >= 0)
+        assert np.all(parent < rows[child])
+        assert np.all(batch["event"][parent] == batch["event"][child])
+        assert np.all(batch["status"][parent] == STATUS_DECAYED)
+
+        p4 = np.stack([batch[name] for name in ("E", "px", "py", "pz")], axis=1)
+        daughters = np.zeros_like(p4)
+        np.add.at(daughters, parent, p4[child])
+        decayed = batch["status"] == STATUS_DECAYED
+        assert np.allclose(daughters[decayed], p4[decayed], rtol=0, atol=1e-9)
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+
+DISPERSION = os.path.join(ROOT, 'Fast Track', 'simulating dispersion')
+
+
+def _load(*file_names):
+    """Run notebook-cell files in one namespace, with np from the notebook preamble"""
+    namespace = {'np': np}
+    for file_name in file_names:
+        with open(os.path.join(DISPERSION, file_name), encoding='utf-8') as file:
+            exec(compile(file.read(), file_name, 'exec'), namespace)
+    return namespace
+
+
+@pytest.fixture(scope='module')
+def ParticleArray():
+    return _load('philox4x32.py', 'class CounterRNG.py', 'class ParticleArray.py')['ParticleArray']
+
+
+def _two_layer_plume(ParticleArray, n=200):
+    """Settling dust near the ground under a passive tracer layer, all in one horizontal cell"""
+    rng = np.random.default_rng(1)
+    lower = ParticleArray(rng.uniform(100, 900, n), rng.uniform(100, 900, n), rng.uniform(5, 15, n),
+                          mass=rng.uniform(0.5, 1.5, n), settling_velocity=0.01)
+    upper = ParticleArray(rng.uniform(100, 900, n), rng.uniform(100, 900, n), rng.uniform(490, 510, n),
+                          mass=rng.uniform(0.5, 1.5, n), ids=np.arange(n, 2 * n))
+    lower.append(upper)
+
+    # Interleave the layers in storage order
+    return lower.take(np.argsort(lower.mass, kind='stable'))
+
+
+def _deposited_mass(particles):
+    calm = {'sigma_h_factor': 0.0, 'sigma_z_factor': 0.0, 'mixing_height': 1000.0}
+    return particles.take(np.arange(len(particles))).update_positions(0.0, 0.0, calm, dt=1.0).mass.sum()
+
+
+def test_merging_keeps_vertical_profile_and_deposition(ParticleArray):
+    particles = _two_layer_plume(ParticleArray)
+    bins = np.arange(0, 1001, 25)
+    profile_before = np.histogram(particles.z, bins, weights=particles.mass)[0]
+    settling_before = particles.mass[particles.settling_velocity > 0].sum()
+    deposited_before = _deposited_mass(particles)
+
+    split, merged = particles.adapt_resolution([0, 1000], [0, 1000], target_per_cell=50)
+
+    assert (split, merged) == (0, 200)
+    assert len(particles) == 200
+    assert np.allclose(np.histogram(particles.z, bins, weights=particles.mass)[0], profile_before,
+                       rtol=1e-12, atol=0)
+    settles = particles.settling_velocity > 0
+    assert np.count_nonzero(settles) == 100
+    assert np.allclose(particles.settling_velocity[settles], 0.01, rtol=1e-12, atol=0)
+    assert particles.mass[settles].sum() == pytest.approx(settling_before, rel=1e-12)
+    assert _deposited_mass(particles) == pytest.approx(deposited_before, rel=1e-12)
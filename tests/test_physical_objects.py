@@ -0,0 +1,26 @@
+import numpy as np
+
+from physical_objects import ObjectType, Planet, PhysicalObjectFactory, PhysicalSystem, SystemType
+
+
+def test_derived_properties_follow_reassignment():
+    planet = Planet(name="Test", mass_kg=6e24, object_type=ObjectType.PLANET, radius_m=6.4e6,
+                    properties={"volume_m3": 1.0})
+    system = PhysicalSystem("Test", SystemType.CUSTOM)
+    system.add_object(planet)
+    assert system.to_columns()["properties.volume_m3"][0] == planet.volume
+
+    planet.radius_m = 1e6
+    assert "volume_m3" not in planet.properties
+    assert planet.volume == (4 / 3) * np.pi * 1e18
+    assert system.to_columns()["properties.density_kg_m3"][0] == planet.density
+
+
+def test_habitable_zone_column():
+    objects = PhysicalObjectFactory.create_solar_system()
+    system = PhysicalSystem("Solar System", SystemType.SOLAR_SYSTEM, objects[0])
+    for obj in objects[1:]:
+        system.add_object(obj)
+    columns = system.to_columns()
+    assert columns["properties.habitable_zone_inner_au"][0] == 0.75
+    assert np.isnan(columns["properties.habitable_zone_inner_au"][1:]).all()
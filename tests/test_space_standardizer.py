@@ -0,0 +1,60 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import space_standardizer
+
+
+def _manifest_paths(manifest_path):
+    connection = sqlite3.connect(manifest_path)
+    try:
+        return {path for (path,) in connection.execute("SELECT path FROM clean_files")}
+    finally:
+        connection.close()
+
+
+def test_latin1_file_does_not_abort_directory_run(tmp_path, capsys):
+    (tmp_path / 'spaces.md').write_text('a\u00a0b\u2003c\n', encoding='utf-8')
+    (tmp_path / 'clean.txt').write_text('plain ascii\n', encoding='utf-8')
+    latin1 = tmp_path / 'latin1.txt'
+    latin1.write_bytes('café crème brûlée\n'.encode('latin-1'))
+    original = latin1.read_bytes()
+    manifest_path = tmp_path / 'manifest.sqlite'
+
+    for workers in (1, 2):
+        changed = space_standardizer.process_directory(str(tmp_path), workers=workers,
+                                                       manifest_path=str(manifest_path))
+        assert changed == (1 if workers == 1 else 0)
+
+    output = capsys.readouterr().out
+    assert 'latin1.txt: not valid UTF-8' in output
+    assert (tmp_path / 'spaces.md').read_text(encoding='utf-8') == 'a b c\n'
+    assert latin1.read_bytes() == original
+    assert _manifest_paths(manifest_path) == {'spaces.md', 'clean.txt'}
+
+
+def test_empty_target_set_scans_nothing(tmp_path):
+    path = tmp_path / 'accents.md'
+    path.write_text('caf\u00e9\u00a0cr\u00e8me\n', encoding='utf-8')
+
+    assert space_standardizer.scan_file(str(path), characters=' ') == {}
+    report = space_standardizer.scan_directory(str(tmp_path), workers=1, characters=' ')
+    assert report['characters'] == []
+    assert report['files_with_matches'] == 0
+
+    result = subprocess.run(
+        [sys.executable, space_standardizer.__file__, str(tmp_path), '--dry-run', '--chars', '0020'],
+        capture_output=True, text=True, cwd=os.path.dirname(space_standardizer.__file__))
+    assert result.returncode == 2
+    assert 'selects no characters' in result.stderr
+
+
+def test_unreadable_file_is_reported_not_fatal(tmp_path):
+    (tmp_path / 'spaces.md').write_text('a\u00a0b\n', encoding='utf-8')
+    os.symlink(tmp_path / 'missing.md', tmp_path / 'broken.md')
+
+    for workers in (1, 2):
+        report = space_standardizer.scan_directory(str(tmp_path), workers=workers)
+        assert report['files'] == {'spaces.md': {'U+00A0': 1}}
+        assert list(report['errors']) == ['broken.md']